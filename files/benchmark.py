@@ -0,0 +1,243 @@
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+
+import numpy as np
+
+from .consts.config import DEFAULT_CONFIG
+from .crossover.crossover import crossover
+from .helper_funcs.generators_funcs import (
+    generate_candidate_points,
+    generate_cells,
+    generate_population,
+    generate_scenario
+)
+from .main import next_generation
+from .mutation.mutation import mutation
+from .selection.selection import selection, selection_indices
+
+
+# scale tiers, the association backends timed at each tier (the loop backend
+# is left out where it takes minutes per plan)
+TIERS = {
+    "small": {"users": 1000, "chromosomes": 50,
+              "methods": ("loop", "vectorized", "grid")},
+    "medium": {"users": 10000, "chromosomes": 500,
+               "methods": ("loop", "vectorized", "grid")},
+    "large": {"users": 100000, "chromosomes": 5000,
+              "methods": ("vectorized", "grid")}
+}
+
+SELECTION_METHODS = ("rws", "sus", "ts")
+CROSSOVER_METHODS = ("simple_arithmetic", "single_arithmetic", "whole_arithmetic")
+MUTATION_METHODS = (("uniform", "cauchy"), ("non_uniform", "cauchy"), ("non_uniform", "gaussian"))
+
+
+def _timed(func, repeat, setup=None):
+    """Time repeat calls of func (setup is called before each call, untimed,
+    and its result is passed to func).
+
+    Returns:
+        (list of) the seconds of each call.
+    """
+
+    times = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _result(tier, benchmark, times, **params):
+    """A row of the results of a benchmark."""
+    return {
+        "tier": tier,
+        "benchmark": benchmark,
+        "params": params,
+        "repeat": len(times),
+        "min": min(times),
+        "median": float(np.median(times)),
+        "mean": float(np.mean(times))
+    }
+
+
+def _scored_pool(population, rng):
+    """Plans of the population with random evaluation results (enough for
+    the genetic operators, which only read the fitness)."""
+    pool = population.get_plans()
+    num_cells = len(pool[0].get_cells())
+    for plan, fitness in zip(pool, rng.uniform(1.9, 2.1, len(pool)).tolist()):
+        plan.set_results(round(fitness, 3), 0, 0.0, 0, [True] * num_cells)
+    return pool
+
+
+def run_tier(tier, repeat=5, generation_repeat=1, seed=0):
+    """Run every benchmark at a scale tier.
+
+    Args:
+        tier: (str) key of TIERS.
+        repeat: (int) number of timed calls of each benchmark.
+        generation_repeat: (int) number of timed generations.
+        seed: (int) seed of the scenario and of the random states.
+
+    Returns:
+        (list of) results (see _result()).
+    """
+
+    sizes = TIERS[tier]
+    config = DEFAULT_CONFIG.replace(NUM_USERS=sizes["users"],
+                                    NUM_CHROMOSOMES=sizes["chromosomes"],
+                                    SCENARIO_SEED=seed,
+                                    SEED=seed)
+    np.random.seed(seed)
+    random.seed(seed)
+    rng = np.random.RandomState(seed)
+    results = []
+
+    users, candidate_points = generate_scenario(config)
+
+    times = _timed(lambda: generate_candidate_points(config.AREA, config.STEP_SIZE, users,
+                                                     config.USERS_THRESHOLD, rng),
+                   repeat)
+    results.append(_result(tier, "generate_candidate_points", times,
+                           users=len(users)))
+
+    for cell_type in ("macro", "micro", "pico", "femto"):
+        num_cells = getattr(config, "NUM_" + cell_type.upper())
+        radius = config.cell_properties(cell_type)["radius"]
+        times = _timed(lambda points: generate_cells(points, cell_type, num_cells, radius,
+                                                     rng, config),
+                       repeat,
+                       setup=lambda: list(candidate_points))
+        results.append(_result(tier, "generate_cells", times, cell_type=cell_type,
+                               cells=num_cells, candidate_points=len(candidate_points)))
+
+    population = generate_population(config.NUM_CHROMOSOMES,
+                                     list(candidate_points),
+                                     users,
+                                     config.NUM_FIXED_MACRO,
+                                     config.FIXED_MACRO_RADIUS,
+                                     config.NUM_MACRO,
+                                     config.MACRO_RADIUS,
+                                     config.NUM_MICRO,
+                                     config.MICRO_RADIUS,
+                                     config.NUM_PICO,
+                                     config.PICO_RADIUS,
+                                     config.NUM_FEMTO,
+                                     config.FEMTO_RADIUS,
+                                     config=config)
+
+    plan = population.get_plan(0)
+    for method in sizes["methods"]:
+        times = _timed(lambda _: plan.connect_users(method, np.random.RandomState(seed)),
+                       repeat,
+                       setup=plan.reset)
+        results.append(_result(tier, "connect_users", times, method=method,
+                               users=len(users), cells=len(plan.get_cells())))
+
+        def connected():
+            plan.reset()
+            plan.connect_users(method, np.random.RandomState(seed))
+            plan.disconnect_unneeded_cells()
+
+        times = _timed(lambda _: plan.calculate_SINR(method), repeat, setup=connected)
+        results.append(_result(tier, "calculate_SINR", times, method=method,
+                               users=len(users), cells=len(plan.get_cells())))
+
+    pool = _scored_pool(population, rng)
+    fitness = np.array([p.get_fitness() for p in pool])
+    for method in SELECTION_METHODS:
+        times = _timed(lambda: selection(pool, method), repeat)
+        results.append(_result(tier, "selection", times, method=method,
+                               chromosomes=len(pool)))
+        times = _timed(lambda: selection_indices(fitness, method), repeat)
+        results.append(_result(tier, "selection_indices", times, method=method,
+                               chromosomes=len(pool)))
+
+    cross_point = random.randint(1, len(pool) - 1)
+    for method in CROSSOVER_METHODS:
+        times = _timed(lambda: crossover(pool, config.CROSSOVER_PROBABILTY, cross_point,
+                                         method, config.ALPHA),
+                       repeat)
+        results.append(_result(tier, "crossover", times, method=method,
+                               chromosomes=len(pool)))
+
+    for method, dist in MUTATION_METHODS:
+        times = _timed(lambda: mutation(pool, config.AREA, config.MUTATION_PROBABILTY,
+                                        method, dist),
+                       repeat)
+        results.append(_result(tier, "mutation", times, method=method, dist=dist,
+                               chromosomes=len(pool)))
+
+    # a generation of the main loop, from plans with random results
+    times = _timed(lambda generation_pool: next_generation(generation_pool, config),
+                   generation_repeat,
+                   setup=lambda: _scored_pool(population, rng))
+    results.append(_result(tier, "generation", times, method=config.ASSOCIATION_METHOD,
+                           users=len(users), chromosomes=len(pool)))
+
+    return results
+
+
+def _commit():
+    """Returns the commit of the working tree, None outside of a git repository."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(tiers=("small", "medium"), repeat=5, generation_repeat=1, path=None):
+    """Run the benchmarks of the given tiers and save them as JSON.
+
+    Args:
+        tiers: (list of) keys of TIERS.
+        repeat: (int) number of timed calls of each benchmark.
+        generation_repeat: (int) number of timed generations.
+        path: (str) the JSON file, None to skip it.
+
+    Returns:
+        (dict) the machine (commit, versions, cpus, date) and the results
+        (see _result(), times in seconds).
+    """
+
+    report = {
+        "commit": _commit(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": []
+    }
+    for tier in tiers:
+        report["results"] += run_tier(tier, repeat, generation_repeat)
+
+    if path is not None:
+        with open(path, mode="w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Time the planning hot paths.")
+    parser.add_argument("--tiers", nargs="+", choices=list(TIERS), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--generation-repeat", type=int, default=1)
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.tiers, args.repeat, args.generation_repeat, args.output)
+    for result in report["results"]:
+        print("{:<8} {:<26} {:>10.6f}s  {}".format(result["tier"],
+                                                   result["benchmark"],
+                                                   result["median"],
+                                                   result["params"]))
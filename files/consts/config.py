@@ -0,0 +1,84 @@
+from . import constants
+
+
+# every setting of a run, the upper case names of constants.py
+SETTINGS = tuple(name for name in vars(constants) if name.isupper())
+
+# settings the users and the candidate points of a run depend on
+SCENARIO_SETTINGS = ("AREA", "NUM_USERS", "STEP_SIZE", "USERS_THRESHOLD", "SCENARIO_SEED")
+
+# prefix of the cell settings (e.g. MICRO_COST) of each cell type
+_CELL_PREFIXES = {
+    "fixed_macro": "FIXED_MACRO",
+    "macro": "MACRO",
+    "micro": "MICRO",
+    "pico": "PICO",
+    "femto": "FEMTO"
+}
+
+
+class Config(object):
+    """Settings of a GA run.
+
+    Holds every setting of constants.py under the same name (e.g.
+    config.AREA), the values of constants.py being the defaults. A config is
+    passed to the plans, cells and generators of a run, so runs with different
+    settings can share a process.
+
+    Configs are not meant to be changed once built, replace() returns a
+    modified copy.
+    """
+
+    def __init__(self, **settings):
+        """
+        Args:
+            settings: the settings that differ from constants.py.
+        """
+
+        for name in SETTINGS:
+            setattr(self, name, getattr(constants, name))
+
+        for name, value in settings.items():
+            if name not in SETTINGS:
+                raise ValueError("unknown setting: {}".format(name))
+            setattr(self, name, value)
+
+    def replace(self, **settings):
+        """Returns a copy of the config with the given settings changed."""
+        return Config(**dict(self.as_dict(), **settings))
+
+    def as_dict(self):
+        """Returns the settings as a dict."""
+        return {name: getattr(self, name) for name in SETTINGS}
+
+    def cell_properties(self, cell_type):
+        """Returns the cost, min users, max users, radius, power and frequency
+        of a cell type (the small cells share SMALL_CELL_FREQ)."""
+        prefix = _CELL_PREFIXES[cell_type]
+        if cell_type in ("fixed_macro", "macro"):
+            frequency = getattr(self, prefix + "_FREQ")
+        else:
+            frequency = self.SMALL_CELL_FREQ
+
+        return {
+            "cost": getattr(self, prefix + "_COST"),
+            "min_users": getattr(self, prefix + "_MIN_USERS"),
+            "max_users": getattr(self, prefix + "_MAX_USERS"),
+            "radius": getattr(self, prefix + "_RADIUS"),
+            "power": getattr(self, prefix + "_POWER"),
+            "frequency": frequency
+        }
+
+    def scenario(self):
+        """Returns the settings the users and candidate points depend on (runs
+        with the same scenario can share them)."""
+        return tuple(getattr(self, name) for name in SCENARIO_SETTINGS)
+
+    def __repr__(self):
+        changed = ["{}={!r}".format(name, getattr(self, name)) for name in SETTINGS
+                   if getattr(self, name) != getattr(constants, name)]
+        return "Config({})".format(", ".join(changed))
+
+
+# the settings of constants.py
+DEFAULT_CONFIG = Config()
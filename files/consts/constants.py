@@ -57,6 +57,32 @@ MICRO_POWER = 10
 PICO_POWER = 10
 FEMTO_POWER = 10
 
+ASSOCIATION_METHOD = "grid"
+GENERATION_WORKERS = 1  # > 1 generates the initial plans in that many processes
+EVALUATION_WORKERS = 1  # > 1 evaluates the plans in that many processes
+EVALUATION_CACHE_SIZE = 0  # > 0 caches that many evaluations by chromosome (see the README)
+INCREMENTAL_EVALUATION = False  # update the parents evaluation after mutation
+INCREMENTAL_MAX_MOVED = 0.1  # fraction of moved cells above which plans are fully evaluated
+LINK_BUDGET_RESOLUTION = None  # meters, quantize the path loss distances (None is exact)
+CHECKPOINT_INTERVAL = 0  # generations between checkpoints (0 disables them)
+CHECKPOINT_PATH = "files/checkpoint.npz"
+RESUME = False  # continue the run saved in CHECKPOINT_PATH (when it exists)
+METRICS_PATH = "files/figs/metrics.csv"  # one row per generation (None disables it)
+METRICS_FORMAT = "csv"  # or "jsonl"
+METRICS_FLUSH_INTERVAL = 10  # generations buffered before writing them
+PRINT_PLANS = True  # print every plan of every generation
+ISLAND_MIGRATION_INTERVAL = 5  # generations between migrations (python -m files.islands)
+ISLAND_MIGRANTS = 2  # best plans leaving each island at every migration
+ISLAND_TOPOLOGY = "ring"  # or "random"
+PROFILE_GENERATIONS = None  # (first, last) generations run under cProfile (None disables it)
+PROFILE_PATH = "files/figs/generation{}.prof"  # {} is replaced by the generation
+SEED = None  # seed of the GA random state (None keeps the current state)
+SCENARIO_SEED = None  # seed of the users and candidate points (None draws them from the GA random state)
+RENDER_POLICY = "all"  # best plans drawn: "all", "every", "final", "improvements" or "none"
+RENDER_EVERY = 10  # generations between drawn plans of the "every" policy
+RENDER_DPI = 500
+RENDER_WORKERS = 1  # > 1 draws the figures in that many processes
+BEST_PLANS_PATH = "files/figs/best_plans.csv"  # one row per best plan (None skips it)
 SELECTION_METHOD = "sus"
 CROSSOVER_METHOD = "whole_arithmetic"
 MUTATION_METHOD = "non_uniform"
@@ -64,5 +90,8 @@ MUTATION_TYPE = "gaussian"
 
 CROSSOVER_PROBABILTY = 0.6
 MUTATION_PROBABILTY = 0.4
+ELITISM = 0  # best plans carried over to the next generation without being evaluated again
+STALL_GENERATIONS = 0  # generations without improvement before stopping the run (0 disables it)
+STALL_TOLERANCE = 0.0  # fitness gain above which a generation counts as an improvement
 
 ALPHA = 0.4
@@ -1,15 +1,18 @@
-import copy
-
 import numpy as np
 
-from .simple_arithmetic_crossover import simple_arithmetic_crossover
-from .single_arithmetic_crossover import single_arithmetic_crossover
-from .whole_arithmetic_crossover import whole_arithmetic_crossover
+from .simple_arithmetic_crossover import simple_arithmetic_crossover_batch
+from .single_arithmetic_crossover import single_arithmetic_crossover_batch
+from .whole_arithmetic_crossover import whole_arithmetic_crossover_batch
 
 
-def crossover(pool, crossover_probability, crosspoint, crossover_method, alpha):
+def crossover(pool, crossover_probability, crosspoint, crossover_method, alpha, size=None):
     """Apply crossover method on given pool of plans.
 
+    The parents of every pair are drawn in a single call and their
+    chromosomes are blended as (pairs, non fixed cells, 2) arrays, for
+    single_arithmetic all the alleles are drawn after the parents. Each child
+    is a clone of its parent (see Plan.clone()) receiving its blended row.
+
     Args:
         pool: (list of) plans obj.
         crossover_probability: (int).
@@ -19,39 +22,41 @@ def crossover(pool, crossover_probability, crosspoint, crossover_method, alpha):
             - single_arithmetic
             - whole_arithmetic
         alpha: (int) used to calculate the values in simple_arithmetic and single_arithmetic.
-    
+        size: (int) number of offspring (defaults to an even number of
+              offspring, one pair per two plans of the pool).
+
     Returns:
         (list of) plans
     """
 
-    new_pool = []
-
-    # each crossover generates 2 offspring
-    num_children = len(pool) // 2
+    coords = np.stack([plan.get_coords() for plan in pool])
 
-    for _ in range(num_children):
-        parent1 = np.random.choice(pool)
-        parent2 = np.random.choice(pool)
-        child1 = copy.deepcopy(parent1)
-        child2 = copy.deepcopy(parent2)
+    # each crossover generates 2 offspring (the last child of an odd size is dropped)
+    if size is None:
+        size = len(pool) // 2 * 2
+    num_children = (size + 1) // 2
+    parents = np.random.randint(0, len(pool), size=(num_children, 2))
+    parents1 = coords[parents[:, 0]]
+    parents2 = coords[parents[:, 1]]
+    child1, child2 = parents1, parents2
 
-        num_cells_non_fixed = len(parent1.get_cells("non_fixed"))
-        if crossover_method == "simple_arithmetic":
-            for i in range(crosspoint + 1, num_cells_non_fixed):
-                simple_arithmetic_crossover(child1.get_cells("non_fixed")[i],
-                                            child2.get_cells("non_fixed")[i],
-                                            alpha)
+    if crossover_method == "simple_arithmetic":
+        child1, child2 = simple_arithmetic_crossover_batch(parents1, parents2,
+                                                           alpha, crosspoint)
 
-        elif crossover_method == "single_arithmetic":
-            single_arithmetic_crossover(child1, child2, alpha)
+    elif crossover_method == "single_arithmetic":
+        alleles = np.random.randint(0, coords.shape[1], size=num_children)
+        child1, child2 = single_arithmetic_crossover_batch(parents1, parents2,
+                                                           alpha, alleles)
 
-        elif crossover_method == "whole_arithmetic":
-            for i in range(num_cells_non_fixed):
-                whole_arithmetic_crossover(child1.get_cells("non_fixed")[i],
-                                           child2.get_cells("non_fixed")[i],
-                                           alpha)
+    elif crossover_method == "whole_arithmetic":
+        child1, child2 = whole_arithmetic_crossover_batch(parents1, parents2, alpha)
 
-        new_pool.append(child1)
-        new_pool.append(child2)
+    new_pool = []
+    for (parent1, parent2), row1, row2 in zip(parents.tolist(), child1, child2):
+        for parent, row in ((parent1, row1), (parent2, row2)):
+            child = pool[parent].clone()
+            child.get_coords()[...] = row
+            new_pool.append(child)
 
-    return new_pool
+    return new_pool[:size]
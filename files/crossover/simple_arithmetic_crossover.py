@@ -1,31 +1,22 @@
-import copy
-
 import numpy as np
 
 
-def simple_arithmetic_crossover(cell1, cell2, alpha):
-    """Apply simple arithmetic crossover
+def simple_arithmetic_crossover_batch(coords1, coords2, alpha, crosspoint):
+    """Apply simple arithmetic crossover on whole chromosomes at once.
 
     Args:
-        cell1: (cell objs) first cell.
-        cell2: (cell objs) second cell.
+        coords1: (array) of shape (pairs, non fixed cells, 2), first parents.
+        coords2: (array) of shape (pairs, non fixed cells, 2), second parents.
         alpha: (int) used in calculating the new (x, y) values.
+        crosspoint: (int) cells after the crosspoint are blended.
 
     Returns:
-        None
+        (tuple of) the two arrays of offspring.
     """
 
-
-    c1x = alpha * cell2.get_xcoord() + (1 - alpha) * cell1.get_xcoord()
-    c1y = alpha * cell2.get_ycoord() + (1 - alpha) * cell1.get_ycoord()
-
-    c2x = alpha * cell1.get_xcoord() + (1 - alpha) * cell2.get_xcoord()
-    c2y = alpha * cell1.get_ycoord() + (1 - alpha) * cell2.get_ycoord()
-
-    c1x = round(c1x, 3)
-    c1y = round(c1y, 3)
-    c2x = round(c2x, 3)
-    c2y = round(c2y, 3)
-
-    cell1.set_coords(c1x, c1y)
-    cell2.set_coords(c2x, c2y)
+    child1 = coords1.copy()
+    child2 = coords2.copy()
+    tail = slice(crosspoint + 1, None)
+    child1[:, tail] = np.round(alpha * coords2[:, tail] + (1 - alpha) * coords1[:, tail], 3)
+    child2[:, tail] = np.round(alpha * coords1[:, tail] + (1 - alpha) * coords2[:, tail], 3)
+    return child1, child2
@@ -1,33 +1,25 @@
 import numpy as np
 
 
-def single_arithmetic_crossover(plan1, plan2, alpha):
-    """Apply single arithmetic crossover
+def single_arithmetic_crossover_batch(coords1, coords2, alpha, alleles):
+    """Apply single arithmetic crossover on whole chromosomes at once.
 
     Args:
-        plan1: (plan objs) first plan.
-        plan2: (plan objs) second plan.
+        coords1: (array) of shape (pairs, non fixed cells, 2), first parents.
+        coords2: (array) of shape (pairs, non fixed cells, 2), second parents.
         alpha: (int) used in calculating the new (x, y) values.
+        alleles: (array) the index of the blended cell of each pair.
 
     Returns:
-        None
+        (tuple of) the two arrays of offspring.
     """
 
+    pairs = np.arange(len(coords1))
+    val1 = coords1[pairs, alleles]
+    val2 = coords2[pairs, alleles]
 
-    random_allele = np.random.randint(0, len(plan1.get_cells("non_fixed")))
-
-    val1 = plan1.get_cells("non_fixed")[random_allele]
-    val2 = plan2.get_cells("non_fixed")[random_allele]
-
-    new_val_x1 = round((alpha * val2.get_xcoord() +
-                        (1 - alpha) * val1.get_xcoord()), 3)
-    new_val_y1 = round((alpha * val2.get_ycoord() +
-                        (1 - alpha) * val1.get_ycoord()), 3)
-
-    new_val_x2 = round((alpha * val1.get_xcoord() +
-                        (1 - alpha) * val2.get_xcoord()), 3)
-    new_val_y2 = round((alpha * val1.get_ycoord() +
-                        (1 - alpha) * val2.get_ycoord()), 3)
-
-    plan1.get_cells("non_fixed")[random_allele].set_coords(new_val_x1, new_val_y1)
-    plan2.get_cells("non_fixed")[random_allele].set_coords(new_val_x2, new_val_y2)
+    child1 = coords1.copy()
+    child2 = coords2.copy()
+    child1[pairs, alleles] = np.round(alpha * val2 + (1 - alpha) * val1, 3)
+    child2[pairs, alleles] = np.round(alpha * val1 + (1 - alpha) * val2, 3)
+    return child1, child2
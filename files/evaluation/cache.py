@@ -0,0 +1,91 @@
+from collections import OrderedDict
+import hashlib
+
+
+class EvaluationCache(object):
+    """Bounded LRU cache of plan evaluation results keyed on the chromosome.
+
+    Plans with the same non fixed cell coordinates (the operators round them to
+    three decimal places) get the results of the first evaluation instead of
+    being operated again.
+
+    A chromosome only comes back unchanged when crossover pairs a plan with
+    itself and mutation then leaves every cell in place, so the cache pays
+    off with a low MUTATION_PROBABILTY (and more so with single_arithmetic
+    crossover, which only blends one cell) or once the population has
+    converged. Otherwise it practically never hits (seed 0: 0 hits in 550
+    lookups over 10 generations with the default operators, 11 with
+    single_arithmetic and MUTATION_PROBABILTY 0.02), which is why it is off
+    unless EVALUATION_CACHE_SIZE is set. The per generation hits and misses
+    are in the metrics.
+
+    Attributes:
+        _max_size: (int) maximum number of results kept.
+        _results: (OrderedDict) results (see Plan.get_results()) by key, least
+                  recently used first.
+        _hits: (int) number of lookups that found results.
+        _misses: (int) number of lookups that did not.
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._results = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    # getters
+    def get_hits(self):
+        return self._hits
+
+    def get_misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._results)
+
+    def get_entries(self):
+        """Returns the (key, results) pairs, least recently used first."""
+        return list(self._results.items())
+
+    @staticmethod
+    def key(plan, method):
+        """Returns the cache key of the plan chromosome evaluated with method."""
+        digest = hashlib.blake2b(plan.get_coords().tobytes(), digest_size=16)
+        digest.update(method.encode())
+        return digest.digest()
+
+    def get(self, key):
+        """Returns the results stored under key, None if there are none."""
+        results = self._results.get(key)
+        if results is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._results.move_to_end(key)
+        return results
+
+    # setters
+    def put(self, key, results):
+        """Store results under key, evicting the least recently used ones."""
+        self._results[key] = results
+        self._results.move_to_end(key)
+        while len(self._results) > self._max_size:
+            self._results.popitem(last=False)
+
+    def set_counters(self, hits, misses):
+        self._hits = hits
+        self._misses = misses
+
+    def pprint(self):
+        """Returns the cache counters in a human readable format."""
+
+        lookups = self._hits + self._misses
+        return """
+        cache hits   : {} of {} ({})
+        cache size   : {} of {}
+        """.format(self._hits,
+                   lookups,
+                   (self._hits / lookups) * 100 if lookups else 0,
+                   len(self._results),
+                   self._max_size)
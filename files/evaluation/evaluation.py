@@ -0,0 +1,71 @@
+import numpy as np
+
+from ..consts.constants import ASSOCIATION_METHOD
+
+
+def draw_seeds(num_plans):
+    """Draw one seed per plan from numpy's global random state.
+
+    Every plan is evaluated with its own RandomState, so the results do not
+    depend on the order (or the process) in which the plans are evaluated.
+    """
+    return np.random.randint(0, 2 ** 32, size=num_plans, dtype=np.uint64)
+
+
+def evaluate_pool(pool, method=ASSOCIATION_METHOD, evaluator=None, cache=None,
+                  incremental=False):
+    """Evaluate (operate) every plan of the pool.
+
+    Args:
+        pool: (list of) plans.
+        method: (str) backend used by Plan.operate().
+        evaluator: (ParallelEvaluator) spreads the plans over worker processes,
+                   the plans are evaluated one after the other when None.
+        cache: (EvaluationCache) plans whose chromosome is in the cache get the
+               cached results instead of being operated, chromosomes occurring
+               more than once in the pool are operated once.
+        incremental: (boolean) update the evaluation of the plan each plan was
+                     cloned from (Plan.operate_incremental()) instead of
+                     operating it from scratch. Ignored by the evaluator, its
+                     workers do not hold the parents.
+
+    Returns:
+        None
+    """
+
+    # drawn for every plan so cache hits do not shift the seeds of the others
+    seeds = draw_seeds(len(pool))
+
+    if cache is None:
+        pending = list(range(len(pool)))
+    else:
+        keys = [cache.key(plan, method) for plan in pool]
+        duplicates = {}
+        pending = []
+        for i, (plan, key) in enumerate(zip(pool, keys)):
+            if key in duplicates:
+                duplicates[key].append(i)
+                continue
+            results = cache.get(key)
+            if results is not None:
+                plan.set_results(*results)
+            else:
+                duplicates[key] = []
+                pending.append(i)
+
+    plans = [pool[i] for i in pending]
+    if evaluator is not None:
+        evaluator.evaluate(plans, seeds[pending], method)
+    else:
+        for plan, seed in zip(plans, seeds[pending]):
+            if incremental:
+                plan.operate_incremental(method, np.random.RandomState(seed))
+            else:
+                plan.operate(method, np.random.RandomState(seed))
+
+    if cache is not None:
+        for i in pending:
+            results = pool[i].get_results()
+            cache.put(keys[i], results)
+            for j in duplicates[keys[i]]:
+                pool[j].set_results(*results)
@@ -0,0 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..consts.config import DEFAULT_CONFIG
+from ..objs.cell import Cell
+from ..objs.plan import Plan
+
+
+NON_FIXED_CELL_TYPES = ("macro", "micro", "pico", "femto")
+
+# state of a worker process, set by _init_worker()
+_worker = {}
+
+
+def _share(array):
+    """Copy an array into a new shared memory block."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm
+
+
+def _attach(name, shape, dtype):
+    """Read only view of an array shared by the parent process."""
+    shm = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    array.setflags(write=False)
+    return shm, array
+
+
+def _init_worker(users, candidate_points, fixed_macro_coords, cell_types, config):
+    users_shm, users_array = _attach(*users)
+    cps_shm, cps_array = _attach(*candidate_points)
+
+    _worker["shm"] = (users_shm, cps_shm)
+    _worker["users"] = users_array
+    _worker["candidate_points"] = cps_array
+    _worker["fixed_macro_cells"] = [Cell(x, y, "fixed_macro", config)
+                                    for x, y in fixed_macro_coords.tolist()]
+    _worker["cell_types"] = cell_types
+    _worker["config"] = config
+
+
+def _evaluate(task):
+    """Rebuild a plan from its chromosome, operate it and return its results."""
+    coords, seed, method = task
+    cell_types = _worker["cell_types"]
+    config = _worker["config"]
+    cells = [Cell(x, y, cell_type, config) for (x, y), cell_type in
+             zip(coords.tolist(), cell_types)]
+    fixed_macro_cells = _worker["fixed_macro_cells"]
+
+    plan = Plan(fixed_macro_cells + cells,
+                _worker["users"],
+                _worker["candidate_points"],
+                len(fixed_macro_cells),
+                *[cell_types.count(cell_type) for cell_type in NON_FIXED_CELL_TYPES],
+                coords=coords,
+                config=config)
+    plan.operate(method, np.random.RandomState(seed))
+    return plan.get_results()
+
+
+class ParallelEvaluator(object):
+    """Evaluates plans over a pool of worker processes.
+
+    The users and candidate points are placed once in shared memory, every
+    task only carries the chromosome (non fixed cells coordinates) and the seed
+    of a plan, and only its results (fitness, cost, SINR, connected users and
+    cell states) come back. With the same seeds the results are identical to
+    evaluating the plans in this process.
+
+    Attributes:
+        _executor: (ProcessPoolExecutor) the worker processes.
+        _shared: (list of) shared memory blocks owned by the evaluator.
+        _workers: (int) number of worker processes.
+    """
+
+    def __init__(self, users, candidate_points, fixed_macro_cells, cell_types, workers,
+                 config=DEFAULT_CONFIG):
+        """
+        Args:
+            users: (array) of shape (users, 2) with the users coordinates.
+            candidate_points: (list of) candidate points.
+            fixed_macro_cells: (list of) fixed macro cells shared by the plans.
+            cell_types: (list of) the type of each non fixed cell of the plans.
+            workers: (int) number of worker processes.
+            config: (Config) settings of the plans.
+        """
+
+        users = np.ascontiguousarray(users, dtype=float)
+        candidate_points = np.array(candidate_points, dtype=float).reshape(-1, 2)
+        self._shared = [_share(users), _share(candidate_points)]
+        self._workers = workers
+
+        fixed_macro_coords = np.array([(cell.get_xcoord(), cell.get_ycoord())
+                                       for cell in fixed_macro_cells], dtype=float)
+        try:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=((self._shared[0].name, users.shape, users.dtype),
+                          (self._shared[1].name, candidate_points.shape,
+                           candidate_points.dtype),
+                          fixed_macro_coords,
+                          list(cell_types),
+                          config))
+        except BaseException:
+            self._free_shared()
+            raise
+
+    @classmethod
+    def from_plan(cls, plan, workers):
+        """Build an evaluator for plans with the same layout as plan."""
+        return cls(plan.get_user_coords(),
+                   plan.get_candidate_points(),
+                   plan.get_cells("fixed_macro"),
+                   [cell.get_cell_type() for cell in plan.get_cells("non_fixed")],
+                   workers,
+                   plan.get_config())
+
+    def evaluate(self, pool, seeds, method):
+        """Evaluate every plan of the pool, plan i using seeds[i].
+
+        Args:
+            pool: (list of) plans.
+            seeds: (array) seed of the random state of each plan.
+            method: (str) backend used by Plan.operate().
+
+        Returns:
+            None
+        """
+
+        tasks = [(plan.get_coords(), seed, method) for plan, seed in zip(pool, seeds)]
+        chunksize = max(1, len(tasks) // (4 * self._workers))
+        for plan, results in zip(pool, self._executor.map(_evaluate, tasks,
+                                                          chunksize=chunksize)):
+            plan.set_results(*results)
+
+    def close(self):
+        """Stop the worker processes and free the shared memory."""
+        self._executor.shutdown()
+        self._free_shared()
+
+    def _free_shared(self):
+        for shm in self._shared:
+            shm.close()
+            shm.unlink()
+        self._shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,145 @@
+import os
+import random
+
+import numpy as np
+
+from ..consts.config import DEFAULT_CONFIG
+from ..objs.cell import Cell
+from ..objs.population import Population
+
+
+def _results_arrays(prefix, results):
+    """Pack a list of results (see Plan.get_results()) into arrays."""
+    return {
+        prefix + "_fitness": np.array([r[0] for r in results], dtype=float),
+        prefix + "_cost": np.array([r[1] for r in results], dtype=float),
+        prefix + "_sinr": np.array([r[2] for r in results], dtype=float),
+        prefix + "_connected_users": np.array([r[3] for r in results], dtype=int),
+        prefix + "_cell_states": np.array([r[4] for r in results], dtype=bool),
+    }
+
+
+def _unpack_results(data, prefix, index):
+    """Results of plan index packed by _results_arrays()."""
+    return (float(data[prefix + "_fitness"][index]),
+            int(data[prefix + "_cost"][index]),
+            float(data[prefix + "_sinr"][index]),
+            int(data[prefix + "_connected_users"][index]),
+            data[prefix + "_cell_states"][index].tolist())
+
+
+def save_checkpoint(path, generation, pool, best_plans, cache=None):
+    """Save the state of a GA run to a compressed .npz file.
+
+    The file is written next to path then renamed over it, so a crash while
+    saving leaves the previous checkpoint intact.
+
+    Args:
+        path: (str) the checkpoint file.
+        generation: (int) number of generations done.
+        pool: (list of) evaluated plans of the current generation.
+        best_plans: (list of) best plan of every generation so far.
+        cache: (EvaluationCache) saved along when given (the plans it holds
+               get its results instead of being evaluated again).
+
+    Returns:
+        None
+    """
+
+    first = pool[0]
+    np_state = np.random.get_state()
+    py_state = random.getstate()
+
+    arrays = {
+        "generation": np.array(generation),
+        "users": first.get_user_coords(),
+        "candidate_points": np.array(first.get_candidate_points(), dtype=float).reshape(-1, 2),
+        "fixed_macro": np.array([(cell.get_xcoord(), cell.get_ycoord())
+                                 for cell in first.get_cells("fixed_macro")],
+                                dtype=float).reshape(-1, 2),
+        "cell_types": np.array([cell.get_cell_type() for cell in first.get_cells("non_fixed")]),
+        "pool_coords": np.stack([plan.get_coords() for plan in pool]),
+        "best_coords": np.stack([plan.get_coords() for plan in best_plans]),
+        "np_random_keys": np_state[1],
+        "np_random_pos": np.array(np_state[2]),
+        "np_random_gauss": np.array([np_state[3], np_state[4]], dtype=float),
+        "py_random_state": np.array(py_state[1], dtype=np.uint64),
+        "py_random_gauss": np.array(np.nan if py_state[2] is None else py_state[2]),
+    }
+    arrays.update(_results_arrays("pool", [plan.get_results() for plan in pool]))
+    arrays.update(_results_arrays("best", [plan.get_results() for plan in best_plans]))
+
+    if cache is not None:
+        entries = cache.get_entries()
+        # raw bytes, a bytes array would drop the trailing null bytes of the keys
+        keys = np.frombuffer(b"".join(key for key, _ in entries), dtype=np.uint8)
+        if entries:
+            # an empty cache has no key length to reshape with
+            keys = keys.reshape(len(entries), -1)
+        arrays["cache_keys"] = keys
+        arrays["cache_counters"] = np.array([cache.get_hits(), cache.get_misses()])
+        arrays.update(_results_arrays("cache", [results for _, results in entries]))
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as checkpoint:
+        np.savez_compressed(checkpoint, **arrays)
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(path, cache=None, config=DEFAULT_CONFIG):
+    """Restore the state of a GA run saved by save_checkpoint().
+
+    Numpy's global random state and the random module state are restored, so
+    the run continues exactly like the interrupted one did.
+
+    Args:
+        path: (str) the checkpoint file.
+        cache: (EvaluationCache) filled with the saved cache entries when given.
+        config: (Config) settings of the restored plans.
+
+    Returns:
+        (tuple of)
+            - generation: (int) number of generations done.
+            - pool: (list of) evaluated plans of the current generation.
+            - best_plans: (list of) best plan of every generation so far.
+    """
+
+    with np.load(path) as data:
+        users = data["users"].copy()
+        users.setflags(write=False)
+        candidate_points = [tuple(point) for point in data["candidate_points"].tolist()]
+        fixed_macro_cells = [Cell(x, y, "fixed_macro", config)
+                             for x, y in data["fixed_macro"].tolist()]
+        cell_types = data["cell_types"].tolist()
+
+        plans = []
+        for prefix in ("pool", "best"):
+            population = Population(data[prefix + "_coords"],
+                                    cell_types,
+                                    fixed_macro_cells,
+                                    users,
+                                    candidate_points,
+                                    config)
+            plans.append(population.get_plans())
+            for i, plan in enumerate(plans[-1]):
+                plan.set_results(*_unpack_results(data, prefix, i))
+        pool, best_plans = plans
+
+        if cache is not None and "cache_keys" in data:
+            for i, key in enumerate(data["cache_keys"]):
+                cache.put(key.tobytes(), _unpack_results(data, "cache", i))
+            cache.set_counters(*data["cache_counters"].tolist())
+
+        np.random.set_state(("MT19937",
+                             data["np_random_keys"],
+                             int(data["np_random_pos"]),
+                             int(data["np_random_gauss"][0]),
+                             float(data["np_random_gauss"][1])))
+        py_gauss = float(data["py_random_gauss"])
+        random.setstate((3,
+                         tuple(data["py_random_state"].tolist()),
+                         None if np.isnan(py_gauss) else py_gauss))
+        generation = int(data["generation"])
+
+    return generation, pool, best_plans
+
@@ -1,21 +1,62 @@
-import copy
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
+from ..consts.config import DEFAULT_CONFIG
+from ..evaluation.evaluation import draw_seeds
 from ..network.net_funcs import distance
 from ..objs.cell import Cell
 from ..objs.plan import Plan
-from ..objs.user import User
-from .helper import within
+from ..objs.population import Population
 
+# state of a worker process, set by _init_generator()
+_generator = {}
 
-def generate_cells(candidate_points_list, type_of_cell, num_of_cells, distance_between_cells):
+
+def _bucket(x, y, size):
+    """Returns the key of the size × size bucket holding the point (x, y)."""
+    return int(x // size), int(y // size)
+
+
+def _is_well_positioned(buckets, x, y, spacing):
+    """Returns whether no cell of buckets is closer than spacing to (x, y).
+
+    Args:
+        buckets: (dict) cells coordinates grouped by _bucket(x, y, spacing).
+        x: (num) x coordinate of the point.
+        y: (num) y coordinate of the point.
+        spacing: (num) minimal distance between two cells.
+    """
+
+    if spacing <= 0:
+        return True
+    # distance() rounds to the millimetre, only call it close to the spacing
+    far = (spacing + 0.001) ** 2
+    near = max(spacing - 0.001, 0) ** 2
+    bx, by = _bucket(x, y, spacing)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for cx, cy in buckets.get((bx + dx, by + dy), ()):
+                squared = (x - cx) ** 2 + (y - cy) ** 2
+                if squared < far and (squared < near or distance(x, y, cx, cy) < spacing):
+                    return False
+    return True
+
+
+def generate_cells(candidate_points_list, type_of_cell, num_of_cells, distance_between_cells,
+                   rng=np.random, config=DEFAULT_CONFIG):
     """Generates cells using the given candidate points.
 
-    Generates required cells that can be used to create a population.
+    Generates required cells that can be used to create a population. The
+    candidate points are shuffled and taken in turn when they are at least
+    distance_between_cells away from the cells already planted (only the
+    cells of the neighbouring buckets of a spatial hash are checked). When the
+    points run out before enough cells are planted, the distance is halved
+    and the remaining points are tried again.
 
     Args:
-        candidate_points_list: (list of) candidate points each as a tuple
+        candidate_points_list: (list of) candidate points each as a tuple,
+                               the points used by the cells are removed.
         type_of_cell: (str) representing the type of cell that is to be generated:
                     - fixed_macro
                     - macro
@@ -24,81 +65,138 @@ def generate_cells(candidate_points_list, type_of_cell, num_of_cells, distance_b
                     - femto
         num_of_cells: (int) number of cells to be generated.
         distance_between_cells: (num) the distance (in meters) between every cell.
+        rng: (RandomState) used to shuffle the candidate points (defaults to
+             numpy's global random state).
+        config: (Config) settings of the cells.
 
     Returns:
         (list of) cells
     """
 
-    np.random.shuffle(candidate_points_list)
-    temp_candidate_points_list = copy.deepcopy(candidate_points_list)
+    rng.shuffle(candidate_points_list)
+    used = np.zeros(len(candidate_points_list), dtype=bool)
     cell_list = []
 
-    # append the first cell (needed to ensure that we are not looping over an empty list)
-    cell_coords = candidate_points_list.pop()
-    cell = Cell(cell_coords[0], cell_coords[1], type_of_cell)
-    cell_list.append(cell)
-    # look for the remaining candidate points
-    for cp in temp_candidate_points_list:
-        if len(cell_list) >= num_of_cells:
-            break
-        is_well_positioned = True
-        for c in cell_list:
-            if distance(cp[0], c.get_xcoord(), cp[1], c.get_ycoord()) < distance_between_cells:
-                is_well_positioned = False
+    # the first cell takes the last point, there is no other cell to check
+    cell_coords = candidate_points_list[-1]
+    cell_list.append(Cell(cell_coords[0], cell_coords[1], type_of_cell, config))
+    used[-1] = True
+
+    spacing = distance_between_cells
+    while len(cell_list) < num_of_cells and not used.all():
+        buckets = {}
+        if spacing > 0:
+            for cell in cell_list:
+                x, y = cell.get_xcoord(), cell.get_ycoord()
+                buckets.setdefault(_bucket(x, y, spacing), []).append((x, y))
+
+        # look for the remaining candidate points
+        for i, (x, y) in enumerate(candidate_points_list):
+            if len(cell_list) >= num_of_cells:
                 break
+            if not used[i] and _is_well_positioned(buckets, x, y, spacing):
+                cell_list.append(Cell(x, y, type_of_cell, config))
+                used[i] = True
+                if spacing > 0:
+                    buckets.setdefault(_bucket(x, y, spacing), []).append((x, y))
+
+        # not enough room for the cells, get them closer
+        spacing = spacing / 2 if spacing >= 1 else 0
 
-        if is_well_positioned:
-            cell = Cell(cp[0], cp[1], type_of_cell)
-            cell_list.append(cell)
-            candidate_points_list.pop(candidate_points_list.index(cp))
+    candidate_points_list[:] = [cp for cp, is_used in
+                                zip(candidate_points_list, used.tolist()) if not is_used]
     return cell_list
 
 
-def generate_users(num_of_users, area):
+def generate_users(num_of_users, area, rng=np.random):
     """Generate users in a uniform random way.
 
     Args:
         num_of_users: (int) number of users to generate.
         area: (int) area of interest.
+        rng: (RandomState) source of the coordinates (defaults to numpy's
+             global random state).
 
     Returns:
-        (list of) users.
+        (array) of shape (num_of_users, 2) with the (read only) coordinates of
+        the users, meant to be shared by every plan.
     """
 
-    users = []
-    for _ in range(num_of_users):
-        x = round(np.random.uniform(0, area))
-        y = round(np.random.uniform(0, area))
-        user = User(x, y)
-        users.append(user)
+    users = np.round(rng.uniform(0, area, size=(num_of_users, 2)))
+    users.setflags(write=False)
     return users
 
 
-def generate_candidate_points(area, step, users_list, users_threshold):
+def generate_candidate_points(area, step, users_list, users_threshold, rng=np.random):
     """Generate candidate points in a uniform random way.
-    
+
+    The users of every square are counted at once (a user on the border of
+    two squares counts in both) and one point is drawn in each square holding
+    at least users_threshold users.
+
     Args:
         area: (int) area of interest.
         step: (int) step to jump between each square.
-        users_list: (list of) users.
+        users_list: (array) of shape (users, 2) with the users coordinates.
         users_threshold: (int) minimal number of users within a given area.
+        rng: (RandomState) source of the points (defaults to numpy's global
+             random state).
 
     Returns:
         (list of) candidate_points.
     """
-    candidate_points = []
-    for i in range(0, area, step):
-        for j in range(0, area, step):
-            users_num = 0
-            for user in users_list:
-                if within(i, j, step, user.get_xcoord(), user.get_ycoord()):
-                    users_num += 1
+    users = np.asarray(users_list)
+    num_squares = len(range(0, area, step))
+
+    # users on the border of two squares are within both of them
+    counts = np.zeros(num_squares * num_squares, dtype=int)
+    square = np.floor_divide(users, step).astype(int)
+    on_border = np.mod(users, step) == 0
+    for dx in (0, 1):
+        for dy in (0, 1):
+            x = square[:, 0] - dx
+            y = square[:, 1] - dy
+            valid = (x >= 0) & (x < num_squares) & (y >= 0) & (y < num_squares)
+            if dx:
+                valid &= on_border[:, 0]
+            if dy:
+                valid &= on_border[:, 1]
+            counts += np.bincount(x[valid] * num_squares + y[valid],
+                                  minlength=num_squares * num_squares)
+
+    # one point per square with enough users, drawn in the squares order
+    squares = np.flatnonzero(counts >= users_threshold)
+    low = np.stack([squares // num_squares, squares % num_squares], axis=1) * step
+    points = rng.uniform(low, low + step)
+    return [(round(x, 3), round(y, 3)) for x, y in points.tolist()]
+
+
+def generate_scenario(config=DEFAULT_CONFIG):
+    """Generate the users and the candidate points of a run.
+
+    They are drawn from a RandomState seeded with config.SCENARIO_SEED, or
+    from numpy's global random state when it is None.
+
+    Args:
+        config: (Config) settings of the run (area, users, step size, users
+                threshold and scenario seed).
+
+    Returns:
+        (tuple of) the users (see generate_users()) and the candidate points
+        (see generate_candidate_points()).
+    """
 
-            if users_num >= users_threshold:
-                candidate_point_x = round(np.random.uniform(i, i + step), 3)
-                candidate_point_y = round(np.random.uniform(j, j + step), 3)
-                candidate_points.append((candidate_point_x, candidate_point_y))
-    return candidate_points
+    rng = np.random
+    if config.SCENARIO_SEED is not None:
+        rng = np.random.RandomState(config.SCENARIO_SEED)
+
+    users = generate_users(config.NUM_USERS, config.AREA, rng)
+    candidate_points = generate_candidate_points(config.AREA,
+                                                 config.STEP_SIZE,
+                                                 users,
+                                                 config.USERS_THRESHOLD,
+                                                 rng)
+    return users, candidate_points
 
 
 def generate_initial_population(num_of_plans,
@@ -113,13 +211,14 @@ def generate_initial_population(num_of_plans,
                                 num_pico,
                                 distance_pico,
                                 num_femto,
-                                distance_femto):
+                                distance_femto,
+                                config=DEFAULT_CONFIG):
     """Generate the initial population.
 
     Args:
         num_of_plans: (int) the size of the population.
         candidate_points: (list of) candidate points.
-        users: (list of) users.
+        users: (array) of shape (users, 2) with the users coordinates.
         num_fixed_macro: (int) fixed macro cells.
         distance_fixed_macro: (num) distance between each fixed macro cell.
         num_macro: (int) number of macro cells.
@@ -130,6 +229,7 @@ def generate_initial_population(num_of_plans,
         distance_pico: (num) distance between each pico cell.
         num_femto: (int) number of femto cells.
         distance_femto: (num) distance between each femto cell.
+        config: (Config) settings of the plans.
 
     Returns:
         (list of) plans.
@@ -139,40 +239,47 @@ def generate_initial_population(num_of_plans,
     fixed_macro_cells = generate_cells(candidate_points,
                                        "fixed_macro",
                                        num_fixed_macro,
-                                       distance_fixed_macro)
+                                       distance_fixed_macro,
+                                       config=config)
     for _ in range(num_of_plans):
-        cp = copy.deepcopy(candidate_points)
+        cp = list(candidate_points)
         np.random.shuffle(cp)
 
         # generate cells
         macro_cells = generate_cells(cp,
                                      "macro",
                                      num_macro,
-                                     distance_macro)
+                                     distance_macro,
+                                     config=config)
         micro_cells = generate_cells(cp,
                                      "micro",
                                      num_micro,
-                                     distance_micro)
+                                     distance_micro,
+                                     config=config)
         pico_cells = generate_cells(cp,
                                     "pico",
                                     num_pico,
-                                    distance_pico)
+                                    distance_pico,
+                                    config=config)
         femto_cells = generate_cells(cp,
                                      "femto",
                                      num_femto,
-                                     distance_femto)
+                                     distance_femto,
+                                     config=config)
 
         # generate a new plan
         cells = fixed_macro_cells + macro_cells + \
             micro_cells + pico_cells + femto_cells
+        # users are shared by every plan
         plan = Plan(cells,
-                    copy.deepcopy(users),
-                    copy.deepcopy(cp),
+                    users,
+                    cp,
                     num_fixed_macro,
                     num_macro,
                     num_micro,
                     num_pico,
-                    num_femto)
+                    num_femto,
+                    config=config)
         pool.append(plan)
 
         # empty lists
@@ -180,3 +287,111 @@ def generate_initial_population(num_of_plans,
         micro_cells = []
         cp = []
     return pool
+
+
+def _generate_chromosome(candidate_points, layout, rng):
+    """Plant the non fixed cells of a plan like generate_initial_population() does.
+
+    Args:
+        candidate_points: (list of) candidate points.
+        layout: (list of) tuples (cell type, number of cells, distance between
+                cells) of the non fixed cells.
+        rng: (RandomState) source of the shuffles.
+
+    Returns:
+        (array) of shape (non fixed cells, 2) with the cells coordinates.
+    """
+
+    cp = list(candidate_points)
+    rng.shuffle(cp)
+    coords = []
+    for cell_type, num_cells, distance_between_cells in layout:
+        for cell in generate_cells(cp, cell_type, num_cells, distance_between_cells, rng):
+            coords.append((cell.get_xcoord(), cell.get_ycoord()))
+    return np.array(coords, dtype=float)
+
+
+def _init_generator(candidate_points, layout):
+    _generator["candidate_points"] = candidate_points
+    _generator["layout"] = layout
+
+
+def _generate_chromosomes(seeds):
+    """Generate the chromosome of every seed of a batch (in a worker process)."""
+    return np.stack([_generate_chromosome(_generator["candidate_points"],
+                                          _generator["layout"],
+                                          np.random.RandomState(seed))
+                     for seed in seeds])
+
+
+def generate_population(num_of_plans,
+                        candidate_points,
+                        users,
+                        num_fixed_macro,
+                        distance_fixed_macro,
+                        num_macro,
+                        distance_macro,
+                        num_micro,
+                        distance_micro,
+                        num_pico,
+                        distance_pico,
+                        num_femto,
+                        distance_femto,
+                        workers=1,
+                        config=DEFAULT_CONFIG):
+    """Generate the initial population as a Population.
+
+    The fixed macro cells are planted first (in this process, removing their
+    candidate points), then every plan plants its non fixed cells with its own
+    RandomState, seeded from numpy's global random state. Batches of plans are
+    spread over worker processes which get the candidate points once, the
+    population is the same whatever the number of workers.
+
+    Args:
+        num_of_plans: (int) the size of the population.
+        candidate_points: (list of) candidate points.
+        users: (array) of shape (users, 2) with the users coordinates.
+        num_fixed_macro: (int) fixed macro cells.
+        distance_fixed_macro: (num) distance between each fixed macro cell.
+        num_macro: (int) number of macro cells.
+        distance_macro: (num) the distance between each macro cell.
+        num_micro: (int) number of micro cells.
+        distance_micro: (num) distance between each micro cell.
+        num_pico: (int) number of pico cells.
+        distance_pico: (num) distance between each pico cell.
+        num_femto: (int) number of femto cells.
+        distance_femto: (num) distance between each femto cell.
+        workers: (int) number of worker processes (1 generates the plans in
+                 this process).
+        config: (Config) settings of the plans.
+
+    Returns:
+        (Population)
+    """
+
+    fixed_macro_cells = generate_cells(candidate_points,
+                                       "fixed_macro",
+                                       num_fixed_macro,
+                                       distance_fixed_macro,
+                                       config=config)
+    layout = [("macro", num_macro, distance_macro),
+              ("micro", num_micro, distance_micro),
+              ("pico", num_pico, distance_pico),
+              ("femto", num_femto, distance_femto)]
+    cell_types = [cell_type for cell_type, num_cells, _ in layout
+                  for _ in range(num_cells)]
+    seeds = draw_seeds(num_of_plans)
+
+    if workers > 1:
+        batches = np.array_split(seeds, min(num_of_plans, 4 * workers))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_generator,
+                                 initargs=(list(candidate_points), layout)) as executor:
+            coords = np.concatenate(list(executor.map(_generate_chromosomes, batches)))
+    else:
+        coords = np.stack([_generate_chromosome(candidate_points,
+                                                layout,
+                                                np.random.RandomState(seed))
+                           for seed in seeds])
+
+    return Population(coords, cell_types, fixed_macro_cells, users, candidate_points, config)
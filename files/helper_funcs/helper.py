@@ -1,43 +1,31 @@
-import copy
+from concurrent.futures import ProcessPoolExecutor
 import csv
 
 import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
+from matplotlib.collections import EllipseCollection
 import numpy as np
 
+from ..consts.config import DEFAULT_CONFIG
 from ..consts.constants import (
-    AREA,
-    FIXED_MACRO_RADIUS,
-    MACRO_RADIUS,
-    MICRO_RADIUS,
-    PICO_RADIUS,
-    FEMTO_RADIUS
+    BEST_PLANS_PATH,
+    RENDER_DPI,
+    RENDER_EVERY,
+    RENDER_POLICY,
+    RENDER_WORKERS
 )
 
-from ..network.net_funcs import (
-    distance,
-    received_power
-)
-
-from ..objs.cell import Cell
-from ..objs.plan import Plan
-from ..objs.user import User
-
-
-def within(x, y, size, px, py):
-    """Returns true if a point (px, py) is within a range (x, y, x+size, y+size)."""
-    if(px >= x and px <= x + size):
-        if (py >= y and py <= y + size):
-            return True
-    return False
 
+# (cell type, color, alpha, marker, label) of each cell type, in drawing order
+CELL_STYLES = (
+    ("fixed_macro", "red", 0.1, "ro", "Fixed Macro"),
+    ("macro", "green", 0.1, "g^", "Macro"),
+    ("micro", "blue", 0.2, "b*", "Micro"),
+    ("pico", "magenta", 0.25, "mo", "Pico"),
+    ("femto", "cyan", 0.25, "cx", "Femto"),
+)
 
-def calculate_probability(population):
-    """Calculate the probability of each plan in population."""
-    total_sum = sum([plan.get_fitness() for plan in population])
-    for plan in population:
-        probability = plan.get_fitness() / total_sum
-        plan.set_probability(probability)
+# state of a worker process, set by _init_renderer()
+_renderer = {}
 
 
 def find_best_plan(pool):
@@ -51,126 +39,209 @@ def find_best_plan(pool):
     return best_plan
 
 
-def output_plans(best_plans):
-    """Generate a figure and file of the best_plans."""
-    fitness = []
-    sinr = []
-    connected_users = []
-    active_macro = []
-    active_micro = []
-    active_pico = []
-    active_femto = []
+def stalled(best_fitness, generations, tolerance=0.0):
+    """Whether the best fitness stopped improving.
+
+    Args:
+        best_fitness: (list of) the best fitness of every generation so far.
+        generations: (int) number of generations without improvement that
+                     make a stall (0 never stalls).
+        tolerance: (float) fitness gain above which a generation counts as
+                   an improvement.
+
+    Returns:
+        (boolean) True when none of the last generations beat the best
+        fitness of the generations before them by more than tolerance.
+    """
+
+    if generations < 1 or len(best_fitness) <= generations:
+        return False
+
+    return max(best_fitness[-generations:]) <= max(best_fitness[:-generations]) + tolerance
+
+
+def plans_to_render(best_plans, policy=RENDER_POLICY, every=RENDER_EVERY):
+    """Returns the indices of the best plans to draw.
+
+    Args:
+        best_plans: (list of) best plan of every generation.
+        policy: (str) which plans are drawn:
+            - all          (every plan)
+            - every        (every nth plan, and the last one)
+            - final        (the last plan only)
+            - improvements (the plans better than every plan before them)
+            - none         (no plan)
+        every: (int) n of the every policy.
+
+    Returns:
+        (list of) int, indices in best_plans.
+    """
+
+    if not best_plans:
+        return []
 
+    last = len(best_plans) - 1
+    if policy == "all":
+        return list(range(len(best_plans)))
+
+    elif policy == "every":
+        indices = list(range(0, last, every))
+        return indices + [last]
+
+    elif policy == "final":
+        return [last]
+
+    elif policy == "improvements":
+        indices = []
+        best_fitness = None
+        for i, plan in enumerate(best_plans):
+            if best_fitness is None or plan.get_fitness() > best_fitness:
+                best_fitness = plan.get_fitness()
+                indices.append(i)
+        return indices
+
+    elif policy == "none":
+        return []
+
+    raise ValueError("unknown render policy: {}".format(policy))
+
+
+def _drawn_cells(plan):
+    """Returns the coordinates of the cells of a plan that are drawn (the
+    fixed macro cells and the active non fixed cells), by cell type."""
+    cells = {}
+    for cell_type, *_ in CELL_STYLES:
+        cells[cell_type] = np.array([(cell.get_xcoord(), cell.get_ycoord())
+                                     for cell in plan.get_cells(cell_type)
+                                     if cell_type == "fixed_macro" or cell.get_state()],
+                                    dtype=float).reshape(-1, 2)
+    return cells
+
+
+def render_plan(users_xy, cells, path, dpi=RENDER_DPI, config=DEFAULT_CONFIG):
+    """Draw the users and the cells of a plan and save the figure.
+
+    The coverage areas of each cell type are drawn as a single collection.
+
+    Args:
+        users_xy: (array) of shape (users, 2) with the users coordinates.
+        cells: (dict) coordinates (array of shape (cells, 2)) of the cells to
+               draw by cell type (see _drawn_cells()).
+        path: (str) the figure file.
+        dpi: (int) resolution of the figure.
+        config: (Config) settings of the plan (area and cell radiuses).
+
+    Returns:
+        None
+    """
+
+    fig = plt.figure(figsize=(15, 15))
+    ax = fig.gca()
+    ax.grid(True)
+    ax.set_xlim([0, config.AREA])
+    ax.set_ylim([0, config.AREA])
+
+    for cell_type, color, alpha, _, _ in CELL_STYLES:
+        xy = cells[cell_type]
+        if len(xy):
+            radius = config.cell_properties(cell_type)["radius"]
+            diameters = np.full(len(xy), 2 * radius)
+            # transOffset (not offset_transform) is also accepted by matplotlib < 3.6
+            ax.add_collection(EllipseCollection(diameters, diameters, 0,
+                                                units="xy",
+                                                offsets=xy,
+                                                transOffset=ax.transData,
+                                                color=color,
+                                                alpha=alpha))
+
+    ax.plot(users_xy[:, 0], users_xy[:, 1], 'k.', label="Users")
+    for cell_type, _, _, marker, label in CELL_STYLES:
+        ax.plot(cells[cell_type][:, 0], cells[cell_type][:, 1], marker, label=label)
+    ax.legend(loc="upper center", bbox_to_anchor=(
+        0.5, -0.05), shadow=True, ncol=3)
+
+    fig.savefig(path, dpi=dpi, format="png")
+    plt.close(fig)
+
+
+def _init_renderer(users_xy, dpi, config):
+    _renderer["users"] = users_xy
+    _renderer["dpi"] = dpi
+    _renderer["config"] = config
+
+
+def _render_figure(job):
+    """Draw one plan (in a worker process), job is (cells, path)."""
+    cells, path = job
+    render_plan(_renderer["users"], cells, path, _renderer["dpi"], _renderer["config"])
+
+
+def _write_best_plans(best_plans, path):
+    """Write one row (fitness, SINR, connected users and active cells of each
+    type) per best plan to the CSV file at path."""
+
+    rows = []
     for plan in best_plans:
-        users_x = []
-        users_y = []
-        fmacro_x = []
-        fmacro_y = []
-        macro_x = []
-        macro_y = []
-        micro_x = []
-        micro_y = []
-        pico_x = []
-        pico_y = []
-        femto_x = []
-        femto_y = []
-
-        for cell in plan.get_cells('all'):
-            if cell.get_cell_type() == 'fixed_macro':
-                fmacro_x.append(cell.get_xcoord())
-                fmacro_y.append(cell.get_ycoord())
-
-            else:
-                if cell.get_state():
-                    if cell.get_cell_type() == 'macro':
-                        macro_x.append(cell.get_xcoord())
-                        macro_y.append(cell.get_ycoord())
-
-                    elif cell.get_cell_type() == 'micro':
-                        micro_x.append(cell.get_xcoord())
-                        micro_y.append(cell.get_ycoord())
-
-                    elif cell.get_cell_type() == 'pico':
-                        pico_x.append(cell.get_xcoord())
-                        pico_y.append(cell.get_ycoord())
-
-                    elif cell.get_cell_type() == 'femto':
-                        femto_x.append(cell.get_xcoord())
-                        femto_y.append(cell.get_ycoord())
-
-        for user in plan.get_users():
-            users_x.append(user.get_xcoord())
-            users_y.append(user.get_ycoord())
-
-        plt.grid(True)
-        plt.figure(figsize=(15, 15))
-        plt.gca().set_xlim([0, AREA])
-        plt.gca().set_ylim([0, AREA])
-        # plt.axis("equal")
-
-        for i in range(len(fmacro_x)):
-            c = plt.Circle((fmacro_x[i], fmacro_y[i]),
-                           radius=FIXED_MACRO_RADIUS, color="red", alpha=0.1, clip_on=True)
-            plt.gcf().gca().add_artist(c)
-
-        for i in range(len(macro_x)):
-            c = plt.Circle((macro_x[i], macro_y[i]),
-                           radius=MACRO_RADIUS, color="green", alpha=0.1, clip_on=True)
-            plt.gcf().gca().add_artist(c)
-
-        for i in range(len(micro_x)):
-            c = plt.Circle((micro_x[i], micro_y[i]),
-                           radius=MICRO_RADIUS, color="blue", alpha=0.2, clip_on=True)
-            plt.gcf().gca().add_artist(c)
-
-        for i in range(len(pico_x)):
-            c = plt.Circle((pico_x[i], pico_y[i]),
-                           radius=PICO_RADIUS, color="magenta", alpha=0.25, clip_on=True)
-            plt.gcf().gca().add_artist(c)
-
-        for i in range(len(femto_x)):
-            c = plt.Circle((femto_x[i], femto_y[i]),
-                           radius=FEMTO_RADIUS, color="cyan", alpha=0.25, clip_on=True)
-            plt.gcf().gca().add_artist(c)
-
-
-        plt.plot(users_x, users_y, 'k.', label="Users")
-        plt.plot(fmacro_x, fmacro_y, 'ro', label="Fixed Macro")
-        plt.plot(macro_x, macro_y, 'g^', label="Macro")
-        plt.plot(micro_x, micro_y, 'b*', label="Micro")
-        plt.plot(pico_x, pico_y, 'mo', label="Pico")
-        plt.plot(femto_x, femto_y, 'cx', label="Femto")
-        plt.legend(loc="upper center", bbox_to_anchor=(
-            0.5, -0.05), shadow=True, ncol=3)
-
-        plt.savefig("./files/figs/fig" +
-                    str(best_plans.index(plan)) + ".png", dpi=500, format="png")
-
-        plt.clf()
-        plt.close(plt.gcf())
-
-        fitness.append(plan.get_fitness())
-        sinr.append(plan.get_sinr())
-        connected_users.append(plan.get_num_of_connected_users())
-        active_macro.append(len(macro_x))
-        active_micro.append(len(micro_x))
-        active_pico.append(len(pico_x))
-        active_femto.append(len(femto_x))
-
-    with open("./files/figs/best_plans.csv", mode="w") as f:
+        states = {cell_type: sum(cell.get_state() for cell in plan.get_cells(cell_type))
+                  for cell_type in ("macro", "micro", "pico", "femto")}
+        rows.append({
+            "fitness": plan.get_fitness(),
+            "SINR": plan.get_sinr(),
+            "connected users": plan.get_num_of_connected_users(),
+            "active macro": states["macro"],
+            "active micro": states["micro"],
+            "active pico": states["pico"],
+            "active femto": states["femto"]
+        })
+
+    with open(path, mode="w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=[
                                 "fitness", "SINR", "connected users",
                                 "active macro", "active micro", "active pico",
                                 "active femto"])
         writer.writeheader()
-
-        for i in range(len(best_plans)):
-            writer.writerow({
-                "fitness": fitness[i],
-                "SINR": sinr[i],
-                "connected users": connected_users[i],
-                "active macro": active_macro[i],
-                "active micro": active_micro[i],
-                "active pico": active_pico[i],
-                "active femto": active_femto[i]
-            })
+        writer.writerows(rows)
+
+
+def output_plans(best_plans,
+                 policy=RENDER_POLICY,
+                 every=RENDER_EVERY,
+                 dpi=RENDER_DPI,
+                 workers=RENDER_WORKERS,
+                 path=BEST_PLANS_PATH):
+    """Generate a figure and file of the best_plans.
+
+    Every plan gets a row in the CSV file at path, the figures (figN.png for
+    the plan of generation N) are drawn for the plans chosen by the policy.
+
+    Args:
+        best_plans: (list of) best plan of every generation.
+        policy: (str) which plans are drawn (see plans_to_render()).
+        every: (int) n of the every policy.
+        dpi: (int) resolution of the figures.
+        workers: (int) number of processes drawing the figures (the figures
+                 are drawn in this process when 1).
+        path: (str) the CSV file of the best plans, None to skip it.
+
+    Returns:
+        None
+    """
+
+    if path is not None:
+        _write_best_plans(best_plans, path)
+
+    jobs = [(_drawn_cells(best_plans[i]), "./files/figs/fig" + str(i) + ".png")
+            for i in plans_to_render(best_plans, policy, every)]
+    if not jobs:
+        return
+
+    users_xy = best_plans[0].get_user_coords()
+    config = best_plans[0].get_config()
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_renderer,
+                                 initargs=(users_xy, dpi, config)) as executor:
+            list(executor.map(_render_figure, jobs))
+    else:
+        for cells, fig_path in jobs:
+            render_plan(users_xy, cells, fig_path, dpi, config)
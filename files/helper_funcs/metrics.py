@@ -0,0 +1,148 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from ..network.counters import CALLS
+from ..objs.population import NON_FIXED_CELL_TYPES
+
+
+# stages of a generation, every row has time columns for each of them
+STAGES = ("selection", "crossover", "mutation", "evaluation")
+
+
+def generation_metrics(generation, pool, timer=None, calls=None, lookups=None):
+    """Summarize an evaluated generation in a single row.
+
+    Args:
+        generation: (int) the generation number (0 for the initial population).
+        pool: (list of) evaluated plans of the generation.
+        timer: (StageTimer) time spent in each stage of the generation (stages
+               of STAGES it did not time are reported as 0).
+        calls: (dict) distances and received powers computed during the
+               generation (see counters.since()).
+        lookups: (tuple of) the evaluation cache hits and misses of the
+                 generation.
+
+    Returns:
+        (dict) the fitness (best, mean and worst), SINR and connected users
+        (best plan and mean), the active cells of each type of the best plan,
+        the wall clock and CPU time of each stage (as "time <stage>" and
+        "cpu <stage>"), the calls (as "<counter> calls") and the cache hits
+        and misses.
+    """
+
+    fitness = np.array([plan.get_fitness() for plan in pool], dtype=float)
+    sinr = np.array([plan.get_sinr() for plan in pool], dtype=float)
+    connected_users = np.array([plan.get_num_of_connected_users() for plan in pool])
+    best = pool[int(np.argmax(fitness))]
+
+    row = {
+        "generation": generation,
+        "best fitness": float(fitness.max()),
+        "mean fitness": round(float(fitness.mean()), 3),
+        "worst fitness": float(fitness.min()),
+        "best SINR": float(best.get_sinr()),
+        "mean SINR": round(float(sinr.mean()), 3),
+        "best connected users": int(best.get_num_of_connected_users()),
+        "mean connected users": round(float(connected_users.mean()), 3),
+    }
+    for cell_type in NON_FIXED_CELL_TYPES:
+        row["active " + cell_type] = sum(cell.get_state() for cell in best.get_cells(cell_type))
+    wall = dict.fromkeys(STAGES, 0.0)
+    cpu = dict.fromkeys(STAGES, 0.0)
+    if timer is not None:
+        wall.update(timer.get_wall())
+        cpu.update(timer.get_cpu())
+    for stage, seconds in wall.items():
+        row["time " + stage] = round(seconds, 6)
+    for stage, seconds in cpu.items():
+        row["cpu " + stage] = round(seconds, 6)
+
+    counts = dict.fromkeys(CALLS, 0)
+    counts.update(calls or {})
+    for name, count in counts.items():
+        row[name + " calls"] = count
+
+    row["cache hits"], row["cache misses"] = lookups or (0, 0)
+    return row
+
+
+def cache_lookups(cache, start=(0, 0)):
+    """Returns the (hits, misses) of an evaluation cache since start (a
+    previous cache_lookups() of that cache), (0, 0) without a cache."""
+    if cache is None:
+        return 0, 0
+    return cache.get_hits() - start[0], cache.get_misses() - start[1]
+
+
+class MetricsWriter(object):
+    """Appends one row of metrics per generation to a CSV or JSON Lines file.
+
+    Rows are buffered and written every flush_every rows (and when closing),
+    so the file can be followed while the GA runs without writing it after
+    every generation.
+
+    Attributes:
+        _file: (file) the open metrics file.
+        _format: (str) csv or jsonl.
+        _flush_every: (int) number of rows buffered before writing them.
+        _rows: (list of) buffered rows.
+        _writer: (csv.DictWriter) created on the first CSV row, its fields are
+                 the keys of that row.
+    """
+
+    def __init__(self, path, file_format="csv", flush_every=10, append=False):
+        """
+        Args:
+            path: (str) the metrics file.
+            file_format: (str) csv or jsonl.
+            flush_every: (int) number of rows buffered before writing them.
+            append: (boolean) add the rows to an existing file (e.g. when
+                    resuming a run) instead of starting a new one.
+        """
+
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError("unknown metrics format: {}".format(file_format))
+
+        self._write_header = not (append and os.path.exists(path) and os.path.getsize(path))
+        self._file = open(path, mode="a" if append else "w", newline="")
+        self._format = file_format
+        self._flush_every = flush_every
+        self._rows = []
+        self._writer = None
+
+    def write(self, row):
+        """Buffer a row (dict), writing the buffer once it holds flush_every rows."""
+        self._rows.append(row)
+        if len(self._rows) >= self._flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows to the file."""
+        if self._format == "csv":
+            for row in self._rows:
+                if self._writer is None:
+                    self._writer = csv.DictWriter(self._file, fieldnames=list(row),
+                                                  extrasaction="ignore")
+                    if self._write_header:
+                        self._writer.writeheader()
+                self._writer.writerow(row)
+        else:
+            for row in self._rows:
+                self._file.write(json.dumps(row) + "\n")
+
+        self._rows = []
+        self._file.flush()
+
+    def close(self):
+        """Write the buffered rows and close the file."""
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+import cProfile
+import time
+
+
+class StageTimer(object):
+    """Wall clock and CPU time spent in each stage of a generation.
+
+    The CPU time is the one of this process, the time spent by worker
+    processes only shows in the wall clock time.
+
+    Attributes:
+        _wall: (dict) wall clock seconds of each stage.
+        _cpu: (dict) CPU seconds of each stage.
+    """
+
+    def __init__(self):
+        self._wall = {}
+        self._cpu = {}
+
+    # getters
+    def get_wall(self):
+        return self._wall
+
+    def get_cpu(self):
+        return self._cpu
+
+    @contextmanager
+    def stage(self, name):
+        """Time the code run within the with block as the stage name (the
+        times of a stage timed more than once add up)."""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self._wall[name] = self._wall.get(name, 0.0) + time.perf_counter() - wall
+            self._cpu[name] = self._cpu.get(name, 0.0) + time.process_time() - cpu
+
+
+class GenerationProfiler(object):
+    """Runs a range of generations under cProfile, one .prof file each.
+
+    The files can be read with pstats (or snakeviz and the like). Generations
+    outside of the range run without a profiler.
+
+    Attributes:
+        _generations: (range) the profiled generations, None profiles none.
+        _path: (str) path of the .prof files, formatted with the generation.
+    """
+
+    def __init__(self, generations=None, path="generation{}.prof"):
+        """
+        Args:
+            generations: (tuple of) the first and last (included) profiled
+                         generations, None profiles none.
+            path: (str) path of the .prof files, {} is replaced by the generation.
+        """
+
+        self._generations = None
+        if generations is not None:
+            self._generations = range(generations[0], generations[1] + 1)
+        self._path = path
+
+    @contextmanager
+    def generation(self, generation):
+        """Profile the code run within the with block if generation is in the range."""
+        if self._generations is None or generation not in self._generations:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(self._path.format(generation))
@@ -0,0 +1,322 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+
+import numpy as np
+
+from .consts.config import DEFAULT_CONFIG
+from .evaluation.cache import EvaluationCache
+from .evaluation.evaluation import draw_seeds, evaluate_pool
+from .helper_funcs.generators_funcs import generate_population, generate_scenario
+from .helper_funcs.helper import find_best_plan, output_plans, stalled
+from .helper_funcs.metrics import MetricsWriter, cache_lookups, generation_metrics
+from .helper_funcs.profiling import StageTimer
+from .main import next_generation
+from .network import counters
+from .objs.cell import Cell
+from .objs.population import Population
+
+
+# settings of each island (one island per entry), on top of the run config.
+# Islands should only differ by their operators: migrants carry their
+# evaluation results from one island to another.
+ISLAND_SETTINGS = [
+    {"SELECTION_METHOD": "sus"},
+    {"SELECTION_METHOD": "ts"},
+    {"SELECTION_METHOD": "rws", "CROSSOVER_METHOD": "single_arithmetic"},
+    {"SELECTION_METHOD": "sus", "MUTATION_METHOD": "uniform", "MUTATION_PROBABILTY": 0.1}
+]
+
+# state of a worker process, set by _init_islands()
+_islands = {}
+
+
+def _init_islands(base, users, candidate_points, fixed_macro_coords, cell_types):
+    _islands["base"] = base
+    _islands["users"] = users
+    _islands["candidate_points"] = candidate_points
+    _islands["fixed_macro_cells"] = [Cell(x, y, "fixed_macro", base)
+                                     for x, y in fixed_macro_coords.tolist()]
+    _islands["cell_types"] = cell_types
+
+
+def _pack(plan):
+    """Compact form (chromosome and results) of an evaluated plan."""
+    return plan.get_coords().copy(), plan.get_results()
+
+
+def _cache_state(cache):
+    """Entries (least recently used first) and counters of an island cache,
+    None without a cache."""
+    if cache is None:
+        return None
+    return cache.get_entries(), cache.get_hits(), cache.get_misses()
+
+
+def _evolve(task):
+    """Evolve an island for a number of generations (in a worker process).
+
+    Args:
+        task: (tuple of) the island index, its settings, the chromosomes and
+              results of its plans (None for plans not evaluated yet), the
+              numpy and random module states of the island, its cache state
+              (see _cache_state(), None for an empty cache), the first
+              generation and the number of generations.
+
+    Returns:
+        (tuple of) the chromosomes and results of the island plans, the numpy
+        and random module states, the cache state, the compact best plan of
+        each generation and the metrics row of each generation.
+    """
+
+    (island, settings, coords, results, np_state, py_state, cache_state,
+     first, num_generations) = task
+    config = _islands["base"].replace(**settings)
+    np.random.set_state(np_state)
+    random.setstate(py_state)
+
+    population = Population(coords,
+                            _islands["cell_types"],
+                            _islands["fixed_macro_cells"],
+                            _islands["users"],
+                            _islands["candidate_points"],
+                            config)
+    pool = population.get_plans()
+
+    # the cache of the island outlives the epoch
+    cache = None
+    if config.EVALUATION_CACHE_SIZE > 0:
+        cache = EvaluationCache(config.EVALUATION_CACHE_SIZE)
+        if cache_state is not None:
+            entries, hits, misses = cache_state
+            for key, key_results in entries:
+                cache.put(key, key_results)
+            cache.set_counters(hits, misses)
+
+    best = []
+    rows = []
+    if results is None:
+        timer = StageTimer()
+        calls = counters.snapshot()
+        lookups = cache_lookups(cache)
+        with timer.stage("evaluation"):
+            evaluate_pool(pool, config.ASSOCIATION_METHOD, None, cache)
+        best.append(_pack(find_best_plan(pool)))
+        rows.append(dict(island=island, **generation_metrics(first, pool, timer,
+                                                             counters.since(calls),
+                                                             cache_lookups(cache, lookups))))
+    else:
+        for plan, plan_results in zip(pool, results):
+            plan.set_results(*plan_results)
+
+    for generation in range(first, first + num_generations):
+        calls = counters.snapshot()
+        lookups = cache_lookups(cache)
+        pool, timer = next_generation(pool, config, None, cache)
+        best.append(_pack(find_best_plan(pool)))
+        rows.append(dict(island=island, **generation_metrics(generation + 1, pool, timer,
+                                                             counters.since(calls),
+                                                             cache_lookups(cache, lookups))))
+
+    return (np.stack([plan.get_coords() for plan in pool]),
+            [plan.get_results() for plan in pool],
+            np.random.get_state(),
+            random.getstate(),
+            _cache_state(cache),
+            best,
+            rows)
+
+
+def migrate(islands, topology, num_migrants, rng=np.random):
+    """Move copies of the best plans of every island to other islands.
+
+    The migrants of every island are picked before any island changes, then
+    they replace the worst plans of their destination.
+
+    Args:
+        islands: (list of) [chromosomes, results] of each island, changed in place.
+        topology: (str) destination of the migrants of island i:
+            - ring   (island i + 1)
+            - random (any other island)
+        num_migrants: (int) number of plans leaving each island.
+        rng: (RandomState) source of the random destinations.
+
+    Returns:
+        None
+    """
+
+    num_islands = len(islands)
+    if num_islands < 2 or num_migrants < 1:
+        return
+
+    incoming = [[] for _ in range(num_islands)]
+    for i, (coords, results) in enumerate(islands):
+        fitness = np.array([plan_results[0] for plan_results in results])
+        best = np.argsort(-fitness, kind="stable")[:num_migrants]
+
+        if topology == "ring":
+            destination = (i + 1) % num_islands
+        elif topology == "random":
+            destination = (i + 1 + rng.randint(num_islands - 1)) % num_islands
+        else:
+            raise ValueError("unknown migration topology: {}".format(topology))
+
+        incoming[destination] += [(coords[j].copy(), results[j]) for j in best]
+
+    for (coords, results), migrants in zip(islands, incoming):
+        if not migrants:
+            continue
+        fitness = np.array([plan_results[0] for plan_results in results])
+        worst = np.argsort(fitness, kind="stable")[:len(migrants)]
+        for j, (migrant_coords, migrant_results) in zip(worst.tolist(), migrants):
+            coords[j] = migrant_coords
+            results[j] = migrant_results
+
+
+def run_islands(config=DEFAULT_CONFIG, island_settings=ISLAND_SETTINGS, workers=None):
+    """Run the genetic algorithm as islands evolving side by side.
+
+    The NUM_CHROMOSOMES plans are split into one sub-population per island
+    (sharing the users, candidate points and fixed macro cells), the first
+    NUM_CHROMOSOMES % len(island_settings) islands get one plan more. Every
+    island evolves with its own settings in a worker process for
+    ISLAND_MIGRATION_INTERVAL generations, then the ISLAND_MIGRANTS best plans
+    of every island migrate along the ISLAND_TOPOLOGY. Only the chromosomes,
+    evaluation results, random states and caches (see EVALUATION_CACHE_SIZE)
+    of the islands travel between the processes. The outcome does not depend
+    on the number of workers.
+
+    The plans are not printed, checkpoints are not saved and the plans are
+    evaluated in the island processes (EVALUATION_WORKERS is not used). A
+    stall (see STALL_GENERATIONS) is only checked between migrations.
+
+    Args:
+        config: (Config) settings of the run.
+        island_settings: (list of) dicts, settings of each island on top of config.
+        workers: (int) number of worker processes (defaults to one per island,
+                 up to the number of CPUs, 1 runs the islands in this process).
+
+    Returns:
+        (list of) the best plan (over all the islands) of every generation.
+    """
+
+    if config.SEED is not None:
+        np.random.seed(config.SEED)
+        random.seed(config.SEED)
+
+    num_islands = len(island_settings)
+    if workers is None:
+        workers = min(num_islands, os.cpu_count())
+
+    # one population split between the islands
+    users, candidate_points = generate_scenario(config)
+    candidate_points = list(candidate_points)
+    population = generate_population(config.NUM_CHROMOSOMES,
+                                     candidate_points,
+                                     users,
+                                     config.NUM_FIXED_MACRO,
+                                     config.FIXED_MACRO_RADIUS,
+                                     config.NUM_MACRO,
+                                     config.MACRO_RADIUS,
+                                     config.NUM_MICRO,
+                                     config.MICRO_RADIUS,
+                                     config.NUM_PICO,
+                                     config.PICO_RADIUS,
+                                     config.NUM_FEMTO,
+                                     config.FEMTO_RADIUS,
+                                     config.GENERATION_WORKERS,
+                                     config)
+    fixed_macro_cells = population.get_plan(0).get_cells("fixed_macro")
+    fixed_macro_coords = np.array([(cell.get_xcoord(), cell.get_ycoord())
+                                   for cell in fixed_macro_cells], dtype=float)
+    cell_types = population.get_cell_types().tolist()
+
+    # the remainder of the split goes to the first islands, no plan is left out
+    islands = [[coords, None] for coords in
+               np.array_split(population.get_coords(), num_islands)]
+    seeds = draw_seeds(num_islands + 1)
+    states = [(np.random.RandomState(seed).get_state(), random.Random(int(seed)).getstate(), None)
+              for seed in seeds[:num_islands]]
+    migration_rng = np.random.RandomState(seeds[-1])
+
+    if "figs" not in os.listdir("files"):
+        os.mkdir("files/figs")
+
+    # closed even when an epoch raises
+    metrics = None
+    executor = None
+    try:
+        if config.METRICS_PATH:
+            metrics = MetricsWriter(config.METRICS_PATH,
+                                    config.METRICS_FORMAT,
+                                    config.METRICS_FLUSH_INTERVAL)
+
+        initargs = (config, users, candidate_points, fixed_macro_coords, cell_types)
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_islands,
+                                           initargs=initargs)
+        else:
+            _init_islands(*initargs)
+
+        best_per_generation = []
+        generation = 0
+        while generation < config.NUM_GENERATIONS or not best_per_generation:
+            num_generations = min(config.ISLAND_MIGRATION_INTERVAL,
+                                  config.NUM_GENERATIONS - generation)
+            tasks = [(i, island_settings[i], coords, results, np_state, py_state,
+                      cache_state, generation, num_generations)
+                     for i, ((coords, results), (np_state, py_state, cache_state))
+                     in enumerate(zip(islands, states))]
+            if executor is not None:
+                outcomes = list(executor.map(_evolve, tasks))
+            else:
+                outcomes = [_evolve(task) for task in tasks]
+
+            for i, (coords, results, np_state, py_state, cache_state, best, rows) \
+                    in enumerate(outcomes):
+                islands[i] = [coords, results]
+                states[i] = (np_state, py_state, cache_state)
+                if metrics is not None:
+                    for row in rows:
+                        metrics.write(row)
+
+            # best plan of each generation over all the islands
+            for g in range(len(outcomes[0][5])):
+                best_per_generation.append(max((outcome[5][g] for outcome in outcomes),
+                                               key=lambda packed: packed[1][0]))
+
+            generation += num_generations
+            if stalled([results[0] for _, results in best_per_generation],
+                       config.STALL_GENERATIONS, config.STALL_TOLERANCE):
+                break
+            if generation < config.NUM_GENERATIONS:
+                migrate(islands, config.ISLAND_TOPOLOGY, config.ISLAND_MIGRANTS, migration_rng)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if metrics is not None:
+            metrics.close()
+
+    best_population = Population(np.stack([coords for coords, _ in best_per_generation]),
+                                 cell_types,
+                                 fixed_macro_cells,
+                                 users,
+                                 candidate_points,
+                                 config)
+    best_plans = best_population.get_plans()
+    for plan, (_, results) in zip(best_plans, best_per_generation):
+        plan.set_results(*results)
+
+    output_plans(best_plans,
+                 config.RENDER_POLICY,
+                 config.RENDER_EVERY,
+                 config.RENDER_DPI,
+                 config.RENDER_WORKERS,
+                 config.BEST_PLANS_PATH)
+
+    return best_plans
+
+
+if __name__ == "__main__":
+    run_islands()
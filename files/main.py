@@ -1,84 +1,241 @@
 # std library imports
-import copy
-import csv
 import random
 import os
 
+import numpy as np
+
+from .evaluation.cache import EvaluationCache
+from .evaluation.evaluation import evaluate_pool
+from .evaluation.parallel import ParallelEvaluator
+
+from .helper_funcs.checkpoint_funcs import (
+    load_checkpoint,
+    save_checkpoint
+)
+
 from .helper_funcs.generators_funcs import (
-    generate_candidate_points,
-    generate_initial_population,
-    generate_users
+    generate_population,
+    generate_scenario
 )
 
 from .helper_funcs.helper import (
     find_best_plan,
-    output_plans
+    output_plans,
+    stalled
+)
+
+from .helper_funcs.metrics import (
+    MetricsWriter,
+    cache_lookups,
+    generation_metrics
+)
+
+from .helper_funcs.profiling import (
+    GenerationProfiler,
+    StageTimer
 )
 
+from .network import counters
+
 from .selection.selection import selection
 from .crossover.crossover import crossover
 from .mutation.mutation import mutation
-from .consts.constants import *
-
-
-# lists
-users            = []
-candidate_points = []
-pool             = []
-best_plans       = []
-
-# generate users
-users = generate_users(NUM_USERS, AREA)
-
-# generate candidate points (used to plant cells)
-candidate_points = generate_candidate_points(AREA,
-                                             STEP_SIZE,
-                                             copy.deepcopy(users),
-                                             USERS_THRESHOLD)
-
-
-# generate initial population
-pool = generate_initial_population(NUM_CHROMOSOMES,
-                                   candidate_points,
-                                   users,
-                                   NUM_FIXED_MACRO,
-                                   FIXED_MACRO_RADIUS,
-                                   NUM_MACRO,
-                                   MACRO_RADIUS,
-                                   NUM_MICRO,
-                                   MICRO_RADIUS,
-                                   NUM_PICO,
-                                   PICO_RADIUS,
-                                   NUM_FEMTO,
-                                   FEMTO_RADIUS)
-
-# add the best plan from the initial population
-for plan in pool:
-    plan.operate()
-best_plans.append(find_best_plan(pool))
-
-# start of the genetic algorithm
-for generation in range(NUM_GENERATIONS):
-    print("GENERATION #{}".format(generation + 1)) 
-    for plan in pool:
-        plan.operate()
-        print(plan.pprint())
+from .consts.config import DEFAULT_CONFIG
 
-    # selection
-    pool = selection(pool, SELECTION_METHOD)
 
-    # crossover
-    cross_point = random.randint(1, len(pool) - 1)
-    pool = crossover(pool, CROSSOVER_PROBABILTY, cross_point, CROSSOVER_METHOD, ALPHA)
+def next_generation(pool, config=DEFAULT_CONFIG, evaluator=None, cache=None):
+    """Breed and evaluate the next generation of a pool.
 
-    # mutation
-    mutation(pool, AREA, MUTATION_PROBABILTY, MUTATION_METHOD) 
+    With ELITISM set, the best plans of the pool are carried over with their
+    evaluation results, only len(pool) - ELITISM offspring are selected, bred
+    and evaluated.
+
+    Args:
+        pool: (list of) evaluated plans.
+        config: (Config) settings of the run.
+        evaluator: (ParallelEvaluator) see evaluate_pool().
+        cache: (EvaluationCache) see evaluate_pool().
 
-    # selection of the best plan from each generation
-    best_plans.append(find_best_plan(pool))
+    Returns:
+        (tuple of)
+            - pool: (list of) the elites and the evaluated offspring.
+            - timer: (StageTimer) time spent in each stage.
+    """
 
+    timer = StageTimer()
 
-# create figs directory if it doesn't exist
-if "figs" not in os.listdir("files"):
-    os.mkdir("files/figs")
-output_plans(best_plans)
+    # selection
+    with timer.stage("selection"):
+        fitness = np.array([plan.get_fitness() for plan in pool])
+        elites = [pool[i] for i in np.argsort(-fitness, kind="stable")[:config.ELITISM]]
+        num_offspring = len(pool) - len(elites)
+        cross_point = random.randint(1, len(pool) - 1)
+        pool = selection(pool, config.SELECTION_METHOD, num_offspring)
+
+    # crossover (without elites an odd pool still loses its last child, as before)
+    with timer.stage("crossover"):
+        pool = crossover(pool, config.CROSSOVER_PROBABILTY, cross_point,
+                         config.CROSSOVER_METHOD, config.ALPHA,
+                         num_offspring if elites else None)
+
+    # mutation
+    with timer.stage("mutation"):
+        mutation(pool, config.AREA, config.MUTATION_PROBABILTY, config.MUTATION_METHOD)
+
+    # evaluate the offspring (clones start without any evaluation results)
+    with timer.stage("evaluation"):
+        evaluate_pool(pool, config.ASSOCIATION_METHOD, evaluator, cache,
+                      config.INCREMENTAL_EVALUATION)
+
+    return elites + pool, timer
+
+
+def main(config=DEFAULT_CONFIG, scenario=None):
+    """Run the genetic algorithm.
+
+    Args:
+        config: (Config) settings of the run.
+        scenario: (tuple of) the users and candidate points (see
+                  generate_scenario()) to use instead of generating them, e.g.
+                  shared by the runs of a sweep. The candidate points are
+                  copied, the scenario can be reused.
+
+    Returns:
+        (list of) best plan of every generation (fewer than NUM_GENERATIONS + 1
+        when the run stalls, see STALL_GENERATIONS).
+    """
+
+    # lists
+    users            = []
+    candidate_points = []
+    pool             = []
+    best_plans       = []
+
+    if config.SEED is not None:
+        np.random.seed(config.SEED)
+        random.seed(config.SEED)
+
+    # results of the chromosomes already evaluated
+    cache = None
+    if config.EVALUATION_CACHE_SIZE > 0:
+        cache = EvaluationCache(config.EVALUATION_CACHE_SIZE)
+
+    # create figs directory if it doesn't exist
+    if "figs" not in os.listdir("files"):
+        os.mkdir("files/figs")
+
+    first_generation = 0
+    resumed = config.RESUME and os.path.exists(config.CHECKPOINT_PATH)
+    if resumed:
+        # continue the run saved in the checkpoint
+        first_generation, pool, best_plans = load_checkpoint(config.CHECKPOINT_PATH, cache,
+                                                             config)
+    else:
+        # generate users and candidate points (used to plant cells)
+        if scenario is None:
+            scenario = generate_scenario(config)
+        users, candidate_points = scenario[0], list(scenario[1])
+
+        # generate initial population
+        population = generate_population(config.NUM_CHROMOSOMES,
+                                         candidate_points,
+                                         users,
+                                         config.NUM_FIXED_MACRO,
+                                         config.FIXED_MACRO_RADIUS,
+                                         config.NUM_MACRO,
+                                         config.MACRO_RADIUS,
+                                         config.NUM_MICRO,
+                                         config.MICRO_RADIUS,
+                                         config.NUM_PICO,
+                                         config.PICO_RADIUS,
+                                         config.NUM_FEMTO,
+                                         config.FEMTO_RADIUS,
+                                         config.GENERATION_WORKERS,
+                                         config)
+        pool = population.get_plans()
+
+    # closed even when a generation raises (worker processes, shared memory
+    # and buffered metrics)
+    evaluator = None
+    metrics = None
+    try:
+        # worker processes evaluating the plans (None evaluates them in this process)
+        if config.EVALUATION_WORKERS > 1:
+            evaluator = ParallelEvaluator.from_plan(pool[0], config.EVALUATION_WORKERS)
+
+        # one row of metrics per generation (appended to the metrics of a resumed run)
+        if config.METRICS_PATH:
+            metrics = MetricsWriter(config.METRICS_PATH,
+                                    config.METRICS_FORMAT,
+                                    config.METRICS_FLUSH_INTERVAL,
+                                    resumed)
+
+        # generations run under cProfile (generation 0 is the initial evaluation)
+        profiler = GenerationProfiler(config.PROFILE_GENERATIONS, config.PROFILE_PATH)
+
+        # add the best plan from the initial population
+        if not best_plans:
+            timer = StageTimer()
+            calls = counters.snapshot()
+            lookups = cache_lookups(cache)
+            with profiler.generation(0), timer.stage("evaluation"):
+                evaluate_pool(pool, config.ASSOCIATION_METHOD, evaluator, cache)
+            # only the results of the best plans are kept, not their users state
+            best_plans.append(find_best_plan(pool).copy_results())
+            if metrics is not None:
+                metrics.write(generation_metrics(0, pool, timer, counters.since(calls),
+                                                 cache_lookups(cache, lookups)))
+
+        # start of the genetic algorithm
+        for generation in range(first_generation, config.NUM_GENERATIONS):
+            if config.PRINT_PLANS:
+                print("GENERATION #{}".format(generation + 1))
+                for plan in pool:
+                    print(plan.pprint())
+
+            calls = counters.snapshot()
+            lookups = cache_lookups(cache)
+            with profiler.generation(generation + 1):
+                pool, timer = next_generation(pool, config, evaluator, cache)
+
+            # selection of the best plan from each generation
+            best_plans.append(find_best_plan(pool).copy_results())
+
+            if metrics is not None:
+                metrics.write(generation_metrics(generation + 1, pool, timer,
+                                                 counters.since(calls),
+                                                 cache_lookups(cache, lookups)))
+
+            if config.CHECKPOINT_INTERVAL and (generation + 1) % config.CHECKPOINT_INTERVAL == 0:
+                if metrics is not None:
+                    # the metrics file covers at least the checkpointed generations
+                    metrics.flush()
+                save_checkpoint(config.CHECKPOINT_PATH, generation + 1, pool, best_plans, cache)
+
+            # stop once the best fitness has not improved for STALL_GENERATIONS generations
+            if stalled([plan.get_fitness() for plan in best_plans],
+                       config.STALL_GENERATIONS, config.STALL_TOLERANCE):
+                if config.PRINT_PLANS:
+                    print("STALLED AFTER GENERATION #{}".format(generation + 1))
+                break
+    finally:
+        if metrics is not None:
+            metrics.close()
+        if evaluator is not None:
+            evaluator.close()
+
+    if cache is not None and config.PRINT_PLANS:
+        print(cache.pprint())
+
+    output_plans(best_plans,
+                 config.RENDER_POLICY,
+                 config.RENDER_EVERY,
+                 config.RENDER_DPI,
+                 config.RENDER_WORKERS,
+                 config.BEST_PLANS_PATH)
+
+    return best_plans
+
+
+if __name__ == "__main__":
+    main()
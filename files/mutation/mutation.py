@@ -1,7 +1,47 @@
 import numpy as np
 
-from .non_uniform_mutation import non_uniform_mutation
-from .uniform_mutation import uniform_mutation
+
+def mutate_coords(coords, area, probability, method, dist="cauchy"):
+    """Apply mutation over an array of chromosomes, in place.
+
+    One mask picks the mutated cells of every plan, then all their new
+    coordinates are drawn at once: anywhere in the area for the uniform
+    mutation, or displaced by a Cauchy/Gaussian step for the non uniform
+    one (a coordinate leaving the area is drawn again anywhere in it).
+
+    Args:
+        coords: (array) of shape (plans, non fixed cells, 2) with the cells
+                coordinates (or (non fixed cells, 2) for a single plan).
+        area: (int) area of interest.
+        probability: (int) probability of mutation.
+        method: (str) mutation method.
+            - uniform
+            - non_uniform
+        dist: (str) type of distribution to be used (needed only in non_uniform mutation).
+            - cauchy (default)
+            - gaussian
+
+    Returns:
+        (array) boolean mask of the mutated cells.
+    """
+
+    mutated = np.random.random(coords.shape[:-1]) <= probability
+    num_mutated = int(np.count_nonzero(mutated))
+
+    if method == "uniform":
+        coords[mutated] = np.round(np.random.random((num_mutated, 2)) * area, 3)
+    elif method == "non_uniform":
+        if dist == "cauchy":
+            step = np.random.standard_cauchy((num_mutated, 2))
+        elif dist == "gaussian":
+            step = np.random.normal(size=(num_mutated, 2))
+        new_coords = coords[mutated] + np.round(step, 3)
+
+        outside = (new_coords > area) | (new_coords < 0)
+        new_coords[outside] = np.round(np.random.random(np.count_nonzero(outside)) * area, 3)
+        coords[mutated] = new_coords
+
+    return mutated
 
 
 def mutation(pool, area, probability, method, dist="cauchy"):
@@ -14,7 +54,7 @@ def mutation(pool, area, probability, method, dist="cauchy"):
         method: (str) mutation method.
             - uniform
             - non_uniform
-        dist: (str) type of distribution to be used (needed only in non_uniform_mutation).
+        dist: (str) type of distribution to be used (needed only in non_uniform mutation).
             - cauchy (default)
             - gaussian
 
@@ -22,12 +62,9 @@ def mutation(pool, area, probability, method, dist="cauchy"):
         None
     """
 
-    for plan in pool:
-        # apply for non_fixed cells only.
-        for cell in plan.get_cells("non_fixed"):
-            random_number = np.random.random()
-            if random_number <= probability:
-                if method == "uniform":
-                    uniform_mutation(cell, area)
-                elif method == "non_uniform":
-                    non_uniform_mutation(cell, area, dist)
+    # apply for non_fixed cells only (the plans chromosomes).
+    coords = np.stack([plan.get_coords() for plan in pool])
+    mutated = mutate_coords(coords, area, probability, method, dist)
+    for plan, row, changed in zip(pool, coords, mutated):
+        if changed.any():
+            plan.get_coords()[...] = row
@@ -0,0 +1,149 @@
+import numpy as np
+
+from .counters import CALLS
+
+
+def link_distances(users_xy, cells_xy):
+    """Calculate the Euclidean distance between every user and every cell.
+
+    Args:
+        users_xy: (array) of shape (users, 2) with the users coordinates.
+        cells_xy: (array) of shape (cells, 2) with the cells coordinates.
+
+    Returns:
+        (array) of shape (users, cells) rounded to three decimal places.
+    """
+
+    CALLS["distance"] += len(users_xy) * len(cells_xy)
+    dx = users_xy[:, np.newaxis, 0] - cells_xy[np.newaxis, :, 0]
+    dy = users_xy[:, np.newaxis, 1] - cells_xy[np.newaxis, :, 1]
+    return np.round(np.sqrt(dx ** 2 + dy ** 2), 3)
+
+
+def links_received_power(base_loss, tx_power, draws):
+    """Vectorized counterpart of received_power() for a set of links.
+
+    Args:
+        base_loss: (array) the deterministic part of the path loss of each link
+                   (see LinkBudget.base_loss()).
+        tx_power: (array) 10 * log10(power_bs / num_bs) of each link.
+        draws: (array) uniform(0, 1) draws used as the random path loss term.
+
+    Returns:
+        (array) received power of each link rounded to three decimal places.
+    """
+
+    CALLS["received_power"] += len(draws)
+    path_loss = np.round(base_loss + np.round(draws, 3), 3)
+    return np.round((tx_power - path_loss) + 30, 3)
+
+
+def associate(users_xy, cells_xy, radius, max_users, load, cell_types, link_budget,
+              links=None, rng=np.random):
+    """Connect users to cells using users × cells matrices.
+
+    The power of every link within a cell radius is computed once (one
+    random path loss term per link, drawn user after user and cell after
+    cell), then users are handled in order like Plan.connect_users() does:
+    each user connects to the available cell it receives the most power
+    from (the first one on ties) and a cell stops accepting users once it
+    is full. Users are processed in batches (windows of users that grow
+    while no cell fills up); a batch ends at the first user in range of a
+    cell that filled up earlier in the batch, the next batch starts from
+    that user.
+
+    Args:
+        users_xy: (array) of shape (users, 2) with the users coordinates.
+        cells_xy: (array) of shape (cells, 2) with the cells coordinates.
+        radius: (array) radius of each cell.
+        max_users: (array) maximum number of users of each cell.
+        load: (array) number of users already connected to each cell.
+        cell_types: (list of) str, the type of each cell.
+        link_budget: (LinkBudget) the cell type terms of the received power.
+        links: (tuple of) user indices, cell indices and distances of the links
+               within the cells radius, ordered by user then by cell (e.g. from
+               GridIndex.query()). Computed from the full users × cells distance
+               matrix when not given.
+        rng: (RandomState) source of the random path loss terms.
+
+    Returns:
+        (tuple of)
+            - close: (array) boolean mask over the in range links telling which
+              links made it into the users close_bss.
+            - links: (tuple of) user indices, cell indices, distances and
+              received powers of the in range links, ordered by user then by cell.
+            - serving: (array) index of the serving cell of each user (-1 if
+              the user has no available cell in range).
+            - received: (array) power received from the serving cell.
+    """
+
+    num_users = len(users_xy)
+    if links is None:
+        dist = link_distances(users_xy, cells_xy)
+        link_users, link_cells = np.nonzero(dist < radius)
+        link_dist = dist[link_users, link_cells]
+    else:
+        link_users, link_cells, link_dist = links
+
+    tx_power, frequency_loss = link_budget.cell_terms(cell_types)
+    link_power = links_received_power(
+        link_budget.base_loss(link_dist, frequency_loss[link_cells]),
+        tx_power[link_cells],
+        rng.uniform(0, 1, len(link_users)))
+
+    load = np.array(load, dtype=int)
+    close = np.zeros(len(link_users), dtype=bool)
+    serving = np.full(num_users, -1)
+    received = np.full(num_users, np.nan)
+    first_link = np.searchsorted(link_users, np.arange(num_users + 1))
+
+    start = 0
+    window = 256
+    while start < num_users:
+        stop = min(num_users, start + window)
+        offset = first_link[start]
+        batch = slice(offset, first_link[stop])
+        users_left = stop - start
+        available = (load < max_users)[link_cells[batch]]
+        candidates = np.flatnonzero(available) + offset
+        cand_users = link_users[candidates] - start
+
+        # strongest available cell of each user, the first one on ties
+        k = np.bincount(cand_users, minlength=users_left)
+        connected = np.flatnonzero(k)
+        cand_first = np.cumsum(k) - k
+        cand_power = link_power[candidates]
+        best_power = np.maximum.reduceat(cand_power, cand_first[connected]) \
+            if len(candidates) else cand_power
+        is_best = cand_power == np.repeat(best_power, k[connected])
+        _, first_best = np.unique(cand_users[is_best], return_index=True)
+        best = candidates[is_best][first_best]
+        best_cells = link_cells[best]
+
+        # find the user that fills each cell within this batch
+        order = np.argsort(best_cells, kind="stable")
+        sorted_cells = best_cells[order]
+        group_start = np.searchsorted(sorted_cells, sorted_cells)
+        rank = np.empty(len(order), dtype=int)
+        rank[order] = np.arange(len(order)) - group_start
+        fills = load[best_cells] + rank + 1 == max_users[best_cells]
+        filled_by = np.full(len(cells_xy), num_users)
+        filled_by[best_cells[fills]] = connected[fills] + start
+
+        # the first later user in range of a filled cell sees different candidates
+        later = link_users[batch] > filled_by[link_cells[batch]]
+        if later.any():
+            end = link_users[batch][later].min()
+            window = max(end - start, 64)
+        else:
+            end = stop
+            window *= 2
+
+        accepted = connected + start < end
+        close[candidates[cand_users < end - start]] = True
+        serving[connected[accepted] + start] = best_cells[accepted]
+        received[connected[accepted] + start] = best_power[accepted]
+        np.add.at(load, best_cells[accepted], 1)
+        start = end
+
+    return close, (link_users, link_cells, link_dist, link_power), serving, received
@@ -0,0 +1,14 @@
+# number of user to cell distances and received powers computed by this
+# process (not by worker processes): scalar functions (distance(),
+# received_power()) count one per call, array functions one per link
+CALLS = {"distance": 0, "received_power": 0}
+
+
+def snapshot():
+    """Returns a copy of the counters."""
+    return dict(CALLS)
+
+
+def since(start):
+    """Returns the calls counted since snapshot() returned start."""
+    return {name: count - start[name] for name, count in CALLS.items()}
@@ -0,0 +1,147 @@
+import functools
+
+import numpy as np
+
+from .counters import CALLS
+
+
+class LinkBudget(object):
+    """Terms of received_power() that only depend on the cell type.
+
+    For a given scenario (power, frequency and number of cells of each cell
+    type) the transmitted power 10 * log10(power_bs / num_bs) and the
+    frequency term 20 * log10(frequency) of the path loss are computed once,
+    leaving only the distance terms and the random term to every link. The
+    terms are summed in the same order as path_loss(), so the received powers
+    are the same as the ones of received_power().
+
+    With a resolution, the 20 * log10(distance) term is read from a table of
+    distances quantized to that many meters instead (an approximation meant
+    for very large runs). Distances shorter than the resolution read the
+    entry of the resolution itself, so a user standing on a cell gets a
+    finite path loss.
+
+    Attributes:
+        _tx_power: (dict) transmitted power of each cell type.
+        _frequency_loss: (dict) frequency term of the path loss of each cell type.
+        _resolution: (number) step of the distance table, None to compute the
+                     distance term exactly.
+        _table: (array) distance term of the multiples of _resolution.
+    """
+
+    def __init__(self, layout, resolution=None, max_distance=0):
+        """
+        Args:
+            layout: (iterable of) tuples (cell type, power, frequency, number
+                    of cells) of every cell type of the plans.
+            resolution: (number) step (in meters) of the distance table, None
+                        computes the distance term exactly.
+            max_distance: (number) largest distance held by the table, larger
+                          distances are computed exactly.
+        """
+
+        self._tx_power = {}
+        self._frequency_loss = {}
+        for cell_type, power_bs, frequency, num_bs in layout:
+            self._tx_power[cell_type] = 10 * np.log10(power_bs / num_bs)
+            self._frequency_loss[cell_type] = 20 * np.log10(frequency)
+
+        self._resolution = resolution
+        self._table = None
+        if resolution is not None:
+            steps = np.arange(int(np.ceil(max_distance / resolution)) + 1)
+            with np.errstate(divide="ignore"):
+                self._table = 20 * np.log10(steps * resolution / 1000)
+
+    @classmethod
+    def from_cells(cls, cells, resolution=None):
+        """Returns the (shared) link budget of plans made of cells."""
+        layout = {}
+        for cell in cells:
+            cell_type = cell.get_cell_type()
+            if cell_type not in layout:
+                layout[cell_type] = [cell.get_power(), cell.get_frequency(), 0,
+                                     cell.get_radius()]
+            layout[cell_type][2] += 1
+        return _cached_link_budget(tuple((cell_type,) + tuple(values)
+                                         for cell_type, values in layout.items()),
+                                   resolution)
+
+    # getters
+    def get_tx_power(self, cell_type):
+        return self._tx_power[cell_type]
+
+    def get_frequency_loss(self, cell_type):
+        return self._frequency_loss[cell_type]
+
+    def get_resolution(self):
+        return self._resolution
+
+    def cell_terms(self, cell_types):
+        """Returns the transmitted power and frequency term arrays of the cells.
+
+        Args:
+            cell_types: (iterable of) str, the type of each cell.
+
+        Returns:
+            (tuple of) arrays, the transmitted power and the frequency term of
+            the path loss of each cell.
+        """
+
+        cell_types = list(cell_types)
+        return (np.array([self._tx_power[cell_type] for cell_type in cell_types]),
+                np.array([self._frequency_loss[cell_type] for cell_type in cell_types]))
+
+    def distance_loss(self, distance):
+        """Returns 20 * log10(distance / 1000) (distance in meters, array or number)."""
+        if self._table is None:
+            return 20 * np.log10(distance / 1000)
+
+        # the entry of distance 0 is -inf, shorter links read the first step
+        steps = np.maximum(np.rint(np.asarray(distance) / self._resolution).astype(int), 1)
+        inside = steps < len(self._table)
+        loss = self._table[np.where(inside, steps, 0)]
+        if not np.all(inside):
+            loss = np.where(inside, loss, 20 * np.log10(distance / 1000))
+        return loss if np.ndim(distance) else float(loss)
+
+    def base_loss(self, distance, frequency_loss):
+        """Deterministic part of path_loss().
+
+        Args:
+            distance: (array or number) distance of each link.
+            frequency_loss: (array or number) frequency term of the cell of each link.
+
+        Returns:
+            (array or number) the path loss without its random term, summed in
+            the same order as path_loss().
+        """
+
+        return 92.4 + self.distance_loss(distance) + \
+            frequency_loss + 0.06 * (distance / 1000)
+
+    def received_power(self, cell_type, distance, rng=np.random):
+        """Scalar received_power() of a cell of cell_type.
+
+        Args:
+            cell_type: (str) type of the cell.
+            distance: (number) distance between the user and the cell.
+            rng: (RandomState) source of the random path loss term.
+
+        Returns:
+            A float rounded to three decimal places representing the recieved power.
+        """
+
+        CALLS["received_power"] += 1
+        path_loss = round(self.base_loss(distance, self._frequency_loss[cell_type]) +
+                          round(rng.uniform(0, 1), 3), 3)
+        return round((self._tx_power[cell_type] - path_loss) + 30, 3)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_link_budget(layout, resolution):
+    max_distance = max(radius for _, _, _, _, radius in layout)
+    return LinkBudget([(cell_type, power_bs, frequency, num_bs)
+                       for cell_type, power_bs, frequency, num_bs, _ in layout],
+                      resolution,
+                      max_distance)
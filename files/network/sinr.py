@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def users_sinr(links, connected, received, active, noise):
+    """Calculate the SINR of every connected user using array operations.
+
+    Interference is the power received from every active cell in the user's
+    close_bss, summed user by user and cell by cell like Plan.calculate_SINR()
+    does, so both give the same values.
+
+    Args:
+        links: (tuple of) user indices, cell indices, distances and received
+               powers of the users close_bss links, ordered by user then by cell.
+        connected: (array) boolean mask of the connected users.
+        received: (array) power received by each user from its serving cell.
+        active: (array) boolean mask of the active cells.
+        noise: (number) thermal noise.
+
+    Returns:
+        (tuple of)
+            - sinr: (array) SINR of the connected users, in users order.
+            - total: (number) sum of the users SINR.
+    """
+
+    link_users, link_cells, _, link_power = links
+    interfering = connected[link_users] & active[link_cells]
+    interference = np.bincount(link_users[interfering], weights=link_power[interfering],
+                               minlength=len(connected))
+
+    sinr = received[connected] / (noise ** 2 + interference[connected] + 30)
+    # summed user after user, like the loop over users
+    total = np.cumsum(sinr)[-1] if len(sinr) else 0
+    return sinr, total
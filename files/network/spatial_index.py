@@ -0,0 +1,86 @@
+import numpy as np
+
+from .counters import CALLS
+
+
+class GridIndex(object):
+    """Uniform grid index over cell positions.
+
+    Cells are grouped by radius (i.e. by cell type) and every group gets its
+    own grid whose buckets are as wide as the radius, so a user can only be
+    covered by cells of the group that sit in its own bucket or in one of the
+    eight neighbouring buckets. Building the index is a single sort of the
+    cells bucket keys, cheap enough to be redone after every mutation or
+    crossover.
+
+    Attributes:
+        _cells_xy: (array) of shape (cells, 2) with the cells coordinates.
+        _radius: (array) radius of each cell.
+        _groups: (list of) tuples (radius, origin, shape, starts, cells), one per
+                 distinct radius, where cells are the group's cell indices sorted
+                 by bucket and starts[key]:starts[key + 1] is the slice of cells
+                 lying in the bucket key.
+    """
+
+    def __init__(self, cells_xy, radius):
+        self._cells_xy = np.asarray(cells_xy, dtype=float)
+        self._radius = np.asarray(radius)
+        self._groups = []
+
+        for r in np.unique(self._radius):
+            cells = np.flatnonzero(self._radius == r)
+            buckets = np.floor(self._cells_xy[cells] / r).astype(int)
+            origin = buckets.min(axis=0)
+            shape = buckets.max(axis=0) - origin + 1
+            keys = (buckets[:, 0] - origin[0]) * shape[1] + (buckets[:, 1] - origin[1])
+            order = np.argsort(keys, kind="stable")
+            starts = np.searchsorted(keys[order], np.arange(shape[0] * shape[1] + 1))
+            self._groups.append((r, origin, shape, starts, cells[order]))
+
+    def query(self, users_xy):
+        """Find the cells covering each user.
+
+        Args:
+            users_xy: (array) of shape (users, 2) with the users coordinates.
+
+        Returns:
+            (tuple of) user indices, cell indices and distances (rounded to three
+            decimal places) of every user within the radius of a cell, ordered by
+            user then by cell.
+        """
+
+        users_xy = np.asarray(users_xy, dtype=float)
+        link_users = []
+        link_cells = []
+        link_dist = []
+
+        for r, origin, shape, starts, cells in self._groups:
+            buckets = np.floor(users_xy / r).astype(int) - origin
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    rows = buckets + (dx, dy)
+                    valid = np.flatnonzero((rows[:, 0] >= 0) & (rows[:, 0] < shape[0]) &
+                                           (rows[:, 1] >= 0) & (rows[:, 1] < shape[1]))
+                    keys = rows[valid, 0] * shape[1] + rows[valid, 1]
+                    begin = starts[keys]
+                    counts = starts[keys + 1] - begin
+
+                    users = np.repeat(valid, counts)
+                    first = np.repeat(begin - (np.cumsum(counts) - counts), counts)
+                    found = cells[first + np.arange(len(users))]
+
+                    ddx = users_xy[users, 0] - self._cells_xy[found, 0]
+                    ddy = users_xy[users, 1] - self._cells_xy[found, 1]
+                    dist = np.round(np.sqrt(ddx ** 2 + ddy ** 2), 3)
+                    CALLS["distance"] += len(dist)
+                    within = dist < r
+                    link_users.append(users[within])
+                    link_cells.append(found[within])
+                    link_dist.append(dist[within])
+
+        link_users = np.concatenate(link_users)
+        link_cells = np.concatenate(link_cells)
+        link_dist = np.concatenate(link_dist)
+
+        order = np.argsort(link_users * len(self._cells_xy) + link_cells)
+        return link_users[order], link_cells[order], link_dist[order]
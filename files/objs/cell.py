@@ -1,21 +1,24 @@
 import numpy as np
 
-from ..consts.constants import *
+from ..consts.config import DEFAULT_CONFIG
 
 
 class Cell(object):
     """Representations of cellular network cells.
 
     Attributes:
-        _xcoord: (number) the x coordinate of the cell.
-        _ycoord: (number) the y coordinate of the cell.
+        _coords: (array) of shape (n, 2) holding the coordinates of the cell at
+                 row _slot, either owned by the cell or shared with the other
+                 cells of a plan (see bind_coords()).
+        _slot: (int) the row of _coords holding the coordinates of the cell.
         _cell_type: (str) the type of the cell:
             - fixed_macro
             - macro
             - mirco
             - nano
             - pico
-        _connected_users: (list of) users currently connected to the cell.
+        _connected_users: (list of) indices of the plan users currently connected
+                          to the cell.
         _state: (boolean) the state of the cell(turned on or not).
         _cost: (int) the cost of deploying a cell.
         _min_users: (int) the minimum number of users that must be maintained for
@@ -26,22 +29,25 @@ class Cell(object):
         _frequency: (number) the frequency at which the cell is operating.
     """
 
-    def __init__(self, xcoord, ycoord, cell_type):
+    def __init__(self, xcoord, ycoord, cell_type, config=DEFAULT_CONFIG):
 
-        self._xcoord = xcoord
-        self._ycoord = ycoord
+        self._coords = np.array([[xcoord, ycoord]], dtype=float)
+        self._slot = 0
         self._cell_type = cell_type
         self._connected_users = []
         self._state = True
 
-        self._set_attributes()
+        self._set_attributes(config)
 
     # getters
     def get_xcoord(self):
-        return self._xcoord
+        return float(self._coords[self._slot, 0])
 
     def get_ycoord(self):
-        return self._ycoord
+        return float(self._coords[self._slot, 1])
+
+    def get_connected_users(self):
+        return self._connected_users
 
     def get_num_connected_users(self):
         return len(self._connected_users)
@@ -49,6 +55,9 @@ class Cell(object):
     def get_min_users(self):
         return self._min_users
 
+    def get_max_users(self):
+        return self._max_users
+
     def get_cell_type(self):
         return self._cell_type
 
@@ -69,76 +78,37 @@ class Cell(object):
 
     # setters
     def set_coords(self, x, y):
-        self._xcoord = x
-        self._ycoord = y
+        self._coords[self._slot] = (x, y)
+
+    def bind_coords(self, coords, slot):
+        """Move the coordinates of the cell into row slot of the array coords."""
+        coords[slot] = self._coords[self._slot]
+        self._coords = coords
+        self._slot = slot
 
     def set_state(self, state):
         self._state = state
 
-    def _set_attributes(self):
-        """Set the values of attributes depending on the cell type."""
-        properties = {
-            "fixed_macro":
-            {
-                "cost": FIXED_MACRO_COST,
-                "min_users": FIXED_MACRO_MIN_USERS,
-                "max_users": FIXED_MACRO_MAX_USERS,
-                "radius": FIXED_MACRO_RADIUS,
-                "power": FIXED_MACRO_POWER,
-                "frequency": FIXED_MACRO_FREQ
-            },
-
-            "macro":
-            {
-                "cost": MACRO_COST,
-                "min_users": MACRO_MIN_USERS,
-                "max_users": MACRO_MAX_USERS,
-                "radius": MACRO_RADIUS,
-                "power": MACRO_POWER,
-                "frequency": MACRO_FREQ
-            },
-
-            "micro":
-            {
-                "cost": MICRO_COST,
-                "min_users": MICRO_MIN_USERS,
-                "max_users": MICRO_MAX_USERS,
-                "radius": MICRO_RADIUS,
-                "power": MICRO_POWER,
-                "frequency": SMALL_CELL_FREQ
-            },
-
-            "pico":
-            {
-                "cost": PICO_COST,
-                "min_users": PICO_MIN_USERS,
-                "max_users": PICO_MAX_USERS,
-                "radius": PICO_RADIUS,
-                "power": PICO_POWER,
-                "frequency": SMALL_CELL_FREQ
-            },
-
-            "femto":
-            {
-                "cost": FEMTO_COST,
-                "min_users": FEMTO_MIN_USERS,
-                "max_users": FEMTO_MAX_USERS,
-                "radius": FEMTO_RADIUS,
-                "power": FEMTO_POWER,
-                "frequency": SMALL_CELL_FREQ
-            }
-        }
-
-        cell_type = self.get_cell_type()
-        self._cost = properties[cell_type]["cost"]
-        self._min_users = properties[cell_type]["min_users"]
-        self._max_users = properties[cell_type]["max_users"]
-        self._radius = properties[cell_type]["radius"]
-        self._power = properties[cell_type]["power"]
-        self._frequency = properties[cell_type]["frequency"]
+    def set_connected_users(self, users):
+        self._connected_users = users
+
+    def _set_attributes(self, config=DEFAULT_CONFIG):
+        """Set the values of attributes depending on the cell type (see Config.cell_properties())."""
+        properties = config.cell_properties(self.get_cell_type())
+        self._cost = properties["cost"]
+        self._min_users = properties["min_users"]
+        self._max_users = properties["max_users"]
+        self._radius = properties["radius"]
+        self._power = properties["power"]
+        self._frequency = properties["frequency"]
+
+    def reset(self):
+        """Turn the cell back on without any connected users."""
+        self._connected_users = []
+        self._state = True
 
     def add_user(self, user):
-        """Adds the user to the list of connected users."""
+        """Adds the user (index) to the list of connected users."""
         self._connected_users.append(user)
 
     def is_available(self):
@@ -152,15 +122,20 @@ class Cell(object):
         """Checks if the cell is neeeded based on the number of connected users.
 
         if the number of connected users is less than the minimum then the cell
-        is turned off and the users are left unconnected."""
+        is turned off and the users are left unconnected.
+
+        Returns:
+            (list of) the users that were disconnected from the cell.
+        """
 
         if self.get_num_connected_users() < self.get_min_users():
             self.set_state(False)
 
             # remove each user
-            for user in self._connected_users:
-                user.set_connected_bs(None)
+            disconnected = self._connected_users
             self._connected_users = []
+            return disconnected
+        return []
 
     def pprint(self):
         """Returns information about cell in a human readable format."""
@@ -1,15 +1,19 @@
-from ..network.net_funcs import distance, received_power
-from ..network.net_funcs import received_power
-from ..consts.constants import (
-    THERMAL_NOISE,
-    COST_WEIGHT,
-    COVERAGE_WEIGHT,
-    INTERFERENCE_WEIGHT,
-    MAX_COST,
-    MAX_COVERAGE,
-    MAX_INTERFERENCE,
-    NUM_USERS
-)
+import numpy as np
+
+from .cell import Cell
+from .user import User
+from ..network.association import associate, link_distances
+from ..network.link_budget import LinkBudget
+from ..network.net_funcs import distance
+from ..network.sinr import users_sinr
+from ..network.spatial_index import GridIndex
+from ..consts.config import DEFAULT_CONFIG
+from ..consts.constants import ASSOCIATION_METHOD
+
+
+def _users_in_range(users_xy, cells_xy, radius):
+    """Returns the (sorted) indices of the users within the radius of any of the cells."""
+    return np.flatnonzero((link_distances(users_xy, cells_xy) < radius).any(axis=1))
 
 
 class Plan(object):
@@ -17,7 +21,8 @@ class Plan(object):
 
     Attributes:
         _cell_list: (list of) all the cells in a given plan.
-        _users: (list of) the users associated with the plan.
+        _users: (array) of shape (users, 2) with the coordinates of the users,
+                shared (read only) by every plan of a population.
         _candidate_points: (list of) candidate points used by the plan.
         _fixed_macro_cells: (List of) fixed macro cells(inherited from 4G).
         _macro_cells: (List of) macro cells in the plan.
@@ -27,8 +32,28 @@ class Plan(object):
         _cost: (int) cost in dollars.
         _fitness: (number) fitness of current plan.
         _sinr: (number) signal to Noise ration of the plan.
-        _probability: (number) plan probability (used in SUS and RWS selection determination)
         _connected_users: (number) connected users.
+        _coords: (array) of shape (non fixed cells, 2) holding the coordinates of
+                 the non fixed cells (the chromosome), possibly a row of a
+                 Population coordinates array.
+        _close_links: (tuple of) user indices, cell indices, distances and
+                      received powers of the users close_bss links (cells in
+                      range and available when the user was connected), ordered
+                      by user then by cell. The power of a link is computed once
+                      per evaluation and shared by the association and the SINR.
+        _serving: (array) index (in get_cells()) of the cell each user is
+                  connected to, -1 for unconnected users.
+        _received_power: (array) power each user receives from its cell.
+        _users_sinr: (array) SINR of each user.
+        _sinr_total: (number) unrounded sum of the users SINR.
+        _associated: (array) index of the cell each user was associated with
+                     before the unneeded cells were disconnected.
+        _evaluated_coords: (array) copy of _coords at the last evaluation.
+        _parent: (Plan) the evaluated plan this plan was cloned from, used by
+                 operate_incremental().
+        _link_budget: (LinkBudget) the cell type terms of the received power,
+                      shared by the plans with the same cells.
+        _config: (Config) settings of the run (noise, fitness weights...).
     """
 
     def __init__(
@@ -40,8 +65,11 @@ class Plan(object):
             num_macro_cells,
             num_micro_cells=None,
             num_pico_cells=None,
-            num_femto_cells=None):
+            num_femto_cells=None,
+            coords=None,
+            config=DEFAULT_CONFIG):
 
+        self._config = config
         self._users = users
         self._candidate_points = candidate_points
 
@@ -74,11 +102,23 @@ class Plan(object):
         else:
             self._femto_cells = []
 
+        if coords is None:
+            coords = np.empty((len(self.get_cells("non_fixed")), 2))
+        self.bind_coords(coords)
+
         self._cost = None
         self._fitness = None
         self._sinr = None
-        self._probability = None
         self._connected_users = None
+        self._close_links = None
+        self._serving = None
+        self._received_power = None
+        self._users_sinr = None
+        self._sinr_total = None
+        self._associated = None
+        self._evaluated_coords = None
+        self._parent = None
+        self._link_budget = None
 
     # getters
     def get_cells(self, cells_type="all"):
@@ -114,8 +154,42 @@ class Plan(object):
         return cells
 
     def get_users(self):
+        """Returns the users of the plan as User objects.
+
+        The objects are built from the plan arrays on every call, they reflect
+        the association of the last evaluation of the plan.
+        """
+
+        cells = self.get_cells()
+        users = [User(x, y) for x, y in self._users.tolist()]
+        if self._serving is None:
+            return users
+
+        link_users, link_cells, _, _ = self._close_links
+        for u, c in zip(link_users.tolist(), link_cells.tolist()):
+            users[u].add_to_close_bss(cells[c])
+        for u in np.flatnonzero(self._serving >= 0).tolist():
+            users[u].set_connected_bs(cells[self._serving[u]])
+            users[u].set_received_power(self._received_power[u])
+        for u in np.flatnonzero(~np.isnan(self._users_sinr)).tolist():
+            users[u].set_sinr(self._users_sinr[u])
+        return users
+
+    def get_user_coords(self):
         return self._users
 
+    def get_num_users(self):
+        return len(self._users)
+
+    def get_serving_cells(self):
+        return self._serving
+
+    def get_users_received_power(self):
+        return self._received_power
+
+    def get_users_sinr(self):
+        return self._users_sinr
+
     def get_num_of_connected_users(self):
         return self._connected_users
 
@@ -128,80 +202,179 @@ class Plan(object):
     def get_sinr(self):
         return self._sinr
 
-    def get_probability(self):
-        return self._probability
-
     def get_candidate_points(self):
         return self._candidate_points
 
     def get_num_cells(self, cell_type="macro"):
         return len(self.get_cells(cell_type))
 
+    def get_link_budget(self):
+        if self._link_budget is None:
+            self._link_budget = LinkBudget.from_cells(self.get_cells(),
+                                                      self._config.LINK_BUDGET_RESOLUTION)
+        return self._link_budget
+
+    def get_config(self):
+        return self._config
+
+    def get_coords(self):
+        return self._coords
+
+    def clone(self):
+        """Returns a copy of the plan to be modified by the genetic operators.
+
+        Only the chromosome (the non fixed cells) is copied, the users, the
+        candidate points and the fixed macro cells are shared with the clone,
+        which starts without any evaluation results. The clone keeps a reference
+        to the plan until it is evaluated, see operate_incremental().
+        """
+
+        cells = [Cell(cell.get_xcoord(), cell.get_ycoord(), cell.get_cell_type(), self._config)
+                 for cell in self.get_cells("non_fixed")]
+        clone = Plan(self._fixed_macro_cells + cells,
+                    self._users,
+                    self._candidate_points,
+                    len(self._fixed_macro_cells),
+                    len(self._macro_cells),
+                    len(self._micro_cells),
+                    len(self._pico_cells),
+                    len(self._femto_cells),
+                    coords=np.empty_like(self._coords),
+                    config=self._config)
+        clone._link_budget = self._link_budget
+        if self._associated is not None:
+            clone._parent = self
+        return clone
+
+    def bind_coords(self, coords):
+        """Store the non fixed cells coordinates in the (non fixed cells, 2) array coords."""
+        for slot, cell in enumerate(self.get_cells("non_fixed")):
+            cell.bind_coords(coords, slot)
+        self._coords = coords
+
     # setters
-    def connect_users(self):
-        """Connect users of each plan in pool to available cellular cells."""
+    def reset(self):
+        """Reset the per evaluation state of the plan, its cells and its users."""
+        for cell in self.get_cells():
+            cell.reset()
 
-        for user in self.get_users():
-            user.empty_close_bss()
-            for cell in self.get_cells():
+        num_users = len(self._users)
+        self._cost = None
+        self._fitness = None
+        self._sinr = None
+        self._connected_users = None
+        self._close_links = None
+        self._serving = np.full(num_users, -1)
+        self._received_power = np.full(num_users, np.nan)
+        self._users_sinr = np.full(num_users, np.nan)
+        self._sinr_total = None
+        self._associated = None
+        self._evaluated_coords = None
+        self._parent = None
+
+    def connect_users(self, method=ASSOCIATION_METHOD, rng=np.random):
+        """Connect users of each plan in pool to available cellular cells.
+
+        Args:
+            method: (str) association backend:
+                - loop (user by user, cell by cell)
+                - vectorized (users × cells matrices)
+                - grid (vectorized, only testing cells found by a GridIndex)
+            rng: (RandomState) source of the random path loss terms (defaults
+                 to numpy's global random state).
+        """
+
+        if method in ("vectorized", "grid"):
+            self._connect_users_vectorized(method == "grid", rng)
+            return
+
+        cells = self.get_cells()
+        link_budget = self.get_link_budget()
+        link_users = []
+        link_cells = []
+        link_dist = []
+        link_power = []
+
+        for u, (user_x, user_y) in enumerate(self._users.tolist()):
+            close_bss = []
+            for c, cell in enumerate(cells):
+                dist = distance(user_x, user_y, cell.get_xcoord(), cell.get_ycoord())
                 # if user is within the radius of the cell
-                if distance(user.get_xcoord(), user.get_ycoord(), cell.get_xcoord(),
-                            cell.get_ycoord()) < cell.get_radius():
+                if dist < cell.get_radius():
+                    # drawn once per link, calculate_SINR() reuses it
+                    power = link_budget.received_power(cell.get_cell_type(), dist, rng)
                     # if cell is available
                     if cell.is_available():
-                        user.add_to_close_bss(cell)
+                        close_bss.append((c, power))
+                        link_users.append(u)
+                        link_cells.append(c)
+                        link_dist.append(dist)
+                        link_power.append(power)
             # if user is within at least one base station range
-            if len(user.get_close_bss()):
-                desired = user.get_close_bss()[0]
-                dist = distance(desired.get_xcoord(),
-                                desired.get_ycoord(),
-                                user.get_xcoord(),
-                                user.get_ycoord())
-                num_bs = self.get_num_cells(desired.get_cell_type())
-                power = received_power(desired.get_power(),
-                                       num_bs,
-                                       dist,
-                                       desired.get_frequency(), 0, 0)
-
-                for tested_cell in user.get_close_bss()[1:]:
-                    dist1 = distance(desired.get_xcoord(),
-                                     desired.get_ycoord(),
-                                     user.get_xcoord(),
-                                     user.get_ycoord())
-                    dist2 = distance(tested_cell.get_xcoord(),
-                                     tested_cell.get_ycoord(),
-                                     user.get_xcoord(),
-                                     user.get_ycoord())
-
-                    num_bs = self.get_num_cells(desired.get_cell_type())
-                    power1 = received_power(desired.get_power(),
-                                            num_bs,
-                                            dist1,
-                                            desired.get_frequency(), 0, 0)
-
-                    num_bs = self.get_num_cells(tested_cell.get_cell_type())
-                    power2 = received_power(tested_cell.get_power(),
-                                            num_bs,
-                                            dist2,
-                                            tested_cell.get_frequency(), 0, 0)
-
-                    if power2 > power1:
-                        desired = tested_cell
-                        power = power2
-                    else:
-                        power = power1
-                user.set_connected_bs(desired)
-                user.set_received_power(power)
-                desired.add_user(user)
+            if len(close_bss):
+                serving, power = close_bss[0]
+                for tested, tested_power in close_bss[1:]:
+                    if tested_power > power:
+                        serving = tested
+                        power = tested_power
+                self._serving[u] = serving
+                self._received_power[u] = power
+                cells[serving].add_user(u)
+
+        self._associated = self._serving.copy()
+        self._close_links = (np.array(link_users, dtype=int),
+                             np.array(link_cells, dtype=int),
+                             np.array(link_dist, dtype=float),
+                             np.array(link_power, dtype=float))
+
+    def _connect_users_vectorized(self, use_index=False, rng=np.random):
+        """Vectorized backend of connect_users(), gives the same association.
 
-    def calculate_connected_users(self):
-        users = self.get_users()
-        connected_users = 0
+        Args:
+            use_index: (boolean) look up the cells close to each user with a
+                       GridIndex instead of testing every user against every cell.
+            rng: (RandomState) source of the random path loss terms.
+        """
+        cells = self.get_cells()
+        cells_xy = np.array([(cell.get_xcoord(), cell.get_ycoord())
+                             for cell in cells], dtype=float)
+        radius = np.array([cell.get_radius() for cell in cells])
+
+        links = None
+        if use_index:
+            links = GridIndex(cells_xy, radius).query(self._users)
+
+        close, (link_users, link_cells, link_dist, link_power), serving, received = associate(
+            self._users,
+            cells_xy,
+            radius,
+            np.array([cell.get_max_users() for cell in cells]),
+            np.array([cell.get_num_connected_users() for cell in cells]),
+            [cell.get_cell_type() for cell in cells],
+            self.get_link_budget(),
+            links,
+            rng)
+        self._close_links = (link_users[close], link_cells[close],
+                             link_dist[close], link_power[close])
+
+        connected = np.flatnonzero(serving >= 0)
+        self._serving[connected] = serving[connected]
+        self._received_power[connected] = received[connected]
+        self._associated = self._serving.copy()
+        self._add_cell_users(connected)
+
+    def _add_cell_users(self, users):
+        """Add the users (indices, in users order) to their serving cells."""
+        cells = self.get_cells()
+        serving = self._serving[users]
+        order = np.argsort(serving, kind="stable")
+        bounds = np.searchsorted(serving[order], np.arange(len(cells) + 1))
+        for c, cell in enumerate(cells):
+            cell.set_connected_users(cell.get_connected_users() +
+                                     users[order[bounds[c]:bounds[c + 1]]].tolist())
 
-        for user in users:
-            if user.is_connected():
-                connected_users += 1
-        self._connected_users = connected_users
+    def calculate_connected_users(self):
+        self._connected_users = int(np.count_nonzero(self._serving >= 0))
 
     def calculate_cost(self):
         cost = 0
@@ -210,60 +383,269 @@ class Plan(object):
                 cost += cell.get_cost()
         self._cost = cost
 
-    def calculate_SINR(self):
+    def calculate_SINR(self, method=ASSOCIATION_METHOD):
+        """Calculate the SINR of each connected user and of the plan.
+
+        The interference is made of the powers of the close_bss links computed
+        by connect_users().
+
+        Args:
+            method: (str) loop, or vectorized/grid to compute it with arrays.
+        """
+
+        if method in ("vectorized", "grid"):
+            self._calculate_SINR_vectorized()
+            return
+
         total_SINR = 0
+        cells = self.get_cells()
+        link_users, link_cells, _, link_power = self._close_links
+        first_link = np.searchsorted(link_users, np.arange(len(self._users) + 1))
 
-        for user in self.get_users():
-            if user.is_connected():
-                bs_power = user.get_received_power()
+        for u in range(len(self._users)):
+            if self._serving[u] >= 0:
+                bs_power = self._received_power[u]
                 interference = 0
-                for cell in user.get_close_bss():
-                    if cell.get_state():
-                        dist = distance(cell.get_xcoord(),
-                                        cell.get_ycoord(),
-                                        user.get_xcoord(),
-                                        user.get_ycoord())
-                        num_bs = num_bs = self.get_num_cells(
-                            cell.get_cell_type())
-                        cell_power = received_power(cell.get_power(),
-                                                    num_bs,
-                                                    dist,
-                                                    cell.get_frequency(), 0, 0)
+                for c, cell_power in zip(link_cells[first_link[u]:first_link[u + 1]].tolist(),
+                                         link_power[first_link[u]:first_link[u + 1]].tolist()):
+                    if cells[c].get_state():
                         interference += cell_power
-                sinr = (bs_power) / (THERMAL_NOISE ** 2 + interference + 30)
-                user.set_sinr(sinr)
+                sinr = (bs_power) / (self._config.THERMAL_NOISE ** 2 + interference + 30)
+                self._users_sinr[u] = sinr
                 total_SINR += sinr
+        self._sinr_total = total_SINR
         self._sinr = round(total_SINR, 3)
 
+    def _calculate_SINR_vectorized(self):
+        """Vectorized calculate_SINR(), reusing the links of connect_users()."""
+        cells = self.get_cells()
+        connected = self._serving >= 0
+
+        sinr, total = users_sinr(
+            self._close_links,
+            connected,
+            self._received_power,
+            np.array([cell.get_state() for cell in cells], dtype=bool),
+            self._config.THERMAL_NOISE)
+
+        self._users_sinr[connected] = sinr
+        self._sinr_total = total
+        self._sinr = round(total, 3)
+
     def disconnect_unneeded_cells(self):
         """Disconnect cells that don't have enough users to be active."""
         for cell in self.get_cells():
-            cell.check_if_needed()
+            disconnected = cell.check_if_needed()
+            self._serving[disconnected] = -1
+
+    def calculate_fitness(self, method=ASSOCIATION_METHOD):
+        self.calculate_SINR(method)
+        self._set_fitness()
 
-    def calculate_fitness(self):
-        cost = COST_WEIGHT * (MAX_COST - self.get_cost()) / MAX_COST
+    def _set_fitness(self):
+        """Combine the cost, connected users and SINR into the fitness."""
+        config = self._config
+        cost = config.COST_WEIGHT * (config.MAX_COST - self.get_cost()) / config.MAX_COST
 
-        coverage = COVERAGE_WEIGHT * \
-            (NUM_USERS / self.get_num_of_connected_users() * 100) / MAX_COVERAGE
+        coverage = config.COVERAGE_WEIGHT * \
+            (config.NUM_USERS / self.get_num_of_connected_users() * 100) / config.MAX_COVERAGE
 
-        self.calculate_SINR()
-        interference = INTERFERENCE_WEIGHT * \
-            ((MAX_INTERFERENCE - self.get_sinr()) / MAX_INTERFERENCE)
+        interference = config.INTERFERENCE_WEIGHT * \
+            ((config.MAX_INTERFERENCE - self.get_sinr()) / config.MAX_INTERFERENCE)
 
         fitness = cost + coverage + interference
 
         self._fitness = round(fitness, 3)
 
-    def set_probability(self, new_probability):
-        self._probability = new_probability
+    def get_results(self):
+        """Returns the results of the last evaluation.
+
+        Returns:
+            (tuple of) fitness, cost, SINR, number of connected users and the
+            state of each cell (in get_cells() order).
+        """
+
+        return (self._fitness,
+                self._cost,
+                self._sinr,
+                self._connected_users,
+                [cell.get_state() for cell in self.get_cells()])
 
-    def operate(self):
-        """Operate the plan, by doing the necessary operations."""
-        self.connect_users()
+    def set_results(self, fitness, cost, sinr, connected_users, cell_states):
+        """Store results of an evaluation done elsewhere (see get_results()).
+
+        The per user arrays are not part of the results, get_users() returns
+        unconnected users for such plans.
+        """
+
+        for cell, state in zip(self.get_cells(), cell_states):
+            cell.reset()
+            cell.set_state(state)
+
+        self._fitness = fitness
+        self._cost = cost
+        self._sinr = sinr
+        self._connected_users = connected_users
+        self._close_links = None
+        self._serving = None
+        self._received_power = None
+        self._users_sinr = None
+        self._sinr_total = None
+        self._associated = None
+        self._evaluated_coords = None
+        self._parent = None
+
+    def copy_results(self):
+        """Returns a clone of the plan holding the results of its evaluation
+        but none of its per user arrays (e.g. to keep the best plan of every
+        generation around without keeping every generation's users state)."""
+
+        plan = self.clone()
+        plan.set_results(*self.get_results())
+        return plan
+
+    def operate(self, method=ASSOCIATION_METHOD, rng=np.random):
+        """Operate the plan, by doing the necessary operations.
+
+        Args:
+            method: (str) backend used by connect_users() and calculate_SINR().
+            rng: (RandomState) source of the random path loss terms (defaults
+                 to numpy's global random state).
+        """
+        self.reset()
+        self.connect_users(method, rng)
         self.disconnect_unneeded_cells()
         self.calculate_connected_users()
         self.calculate_cost()
-        self.calculate_fitness()
+        self.calculate_fitness(method)
+        self._evaluated_coords = self._coords.copy()
+
+    def operate_incremental(self, method=ASSOCIATION_METHOD, rng=np.random,
+                            max_moved=None):
+        """Operate the plan by updating the evaluation of the plan it was cloned from.
+
+        Only the users around the cells that moved since the parent was evaluated
+        (in range of their old or new position, or connected to them) are
+        connected again, followed by the unconnected users in range of the cells
+        they left. The SINR is recalculated for those users and for the users
+        of cells whose state changed, and the cost, connected users and SINR of
+        the parent are updated with the difference. The capacity left by the
+        re-connected users goes to whoever asks first, so the association can
+        differ slightly from the one operate() finds, and the links of the
+        re-connected users get new random path loss terms.
+
+        Falls back to operate() when the plan has no evaluated parent or when
+        more than max_moved of its non fixed cells moved.
+
+        Args:
+            method: (str) backend used when falling back to operate().
+            rng: (RandomState) source of the random path loss terms.
+            max_moved: (number) largest fraction of moved non fixed cells that
+                       is updated incrementally (INCREMENTAL_MAX_MOVED of the
+                       plan config when None).
+        """
+
+        if max_moved is None:
+            max_moved = self._config.INCREMENTAL_MAX_MOVED
+
+        parent = self._parent
+        if parent is None or parent._associated is None:
+            self.operate(method, rng)
+            return
+
+        moved = np.flatnonzero((self._coords != parent._evaluated_coords).any(axis=1))
+        if len(moved) > max_moved * len(self._coords):
+            self.operate(method, rng)
+            return
+
+        self.reset()
+        cells = self.get_cells()
+        num_cells = len(cells)
+        moved += len(self._fixed_macro_cells)
+        cells_xy = np.array([(cell.get_xcoord(), cell.get_ycoord())
+                             for cell in cells], dtype=float)
+        old_xy = cells_xy.copy()
+        old_xy[len(self._fixed_macro_cells):] = parent._evaluated_coords
+        radius = np.array([cell.get_radius() for cell in cells])
+        max_users = np.array([cell.get_max_users() for cell in cells])
+        min_users = np.array([cell.get_min_users() for cell in cells])
+        cell_types = [cell.get_cell_type() for cell in cells]
+        link_budget = self.get_link_budget()
+        cell_cost = np.array([cell.get_cost() for cell in cells])
+
+        associated = parent._associated.copy()
+        received = parent._received_power.copy()
+        old_load = np.bincount(associated[associated >= 0], minlength=num_cells)
+        new_links = []
+
+        # few users against every cell, no need for a GridIndex
+        def reconnect(users):
+            close, links, serving, user_power = associate(
+                self._users[users], cells_xy, radius, max_users,
+                np.bincount(associated[associated >= 0], minlength=num_cells),
+                cell_types, link_budget, rng=rng)
+            associated[users] = serving
+            received[users] = user_power
+            link_users, link_cells, link_dist, link_power = links
+            new_links.append((users[link_users[close]], link_cells[close],
+                              link_dist[close], link_power[close]))
+
+        # users around the moved cells, at their old and new positions
+        released = np.union1d(
+            _users_in_range(self._users,
+                            np.concatenate([old_xy[moved], cells_xy[moved]]),
+                            np.concatenate([radius[moved], radius[moved]])),
+            np.flatnonzero(np.isin(associated, moved)))
+        associated[released] = -1
+        received[released] = np.nan
+        reconnect(released)
+
+        # unconnected users in range of the cells that lost users
+        load = np.bincount(associated[associated >= 0], minlength=num_cells)
+        freed = np.flatnonzero(load < old_load)
+        waiting = associated < 0
+        waiting[released] = False
+        waiting = np.flatnonzero(waiting)
+        retried = waiting[_users_in_range(self._users[waiting], cells_xy[freed], radius[freed])]
+        reconnect(retried)
+
+        changed = np.union1d(released, retried)
+        keep = ~np.isin(parent._close_links[0], changed)
+        links = [np.concatenate([parent_array[keep]] + [l[i] for l in new_links])
+                 for i, parent_array in enumerate(parent._close_links)]
+        link_users, link_cells = links[:2]
+        order = np.argsort(link_users * num_cells + link_cells, kind="stable")
+        self._close_links = tuple(array[order] for array in links)
+
+        self._associated = associated
+        self._serving = associated.copy()
+        self._received_power = received
+        self._add_cell_users(np.flatnonzero(associated >= 0))
+        self.disconnect_unneeded_cells()
+
+        # users whose serving cell, links or interfering cells changed
+        active = np.array([cell.get_state() for cell in cells], dtype=bool)
+        flipped = np.flatnonzero(active != (old_load >= min_users))
+        affected = np.union1d(changed, link_users[np.isin(link_cells, flipped)])
+        connected = np.zeros(len(self._users), dtype=bool)
+        connected[affected] = self._serving[affected] >= 0
+
+        sinr, total = users_sinr(self._close_links, connected, received, active,
+                                 self._config.THERMAL_NOISE)
+        self._users_sinr = parent._users_sinr.copy()
+        self._users_sinr[affected] = np.nan
+        self._users_sinr[connected] = sinr
+        self._sinr_total = parent._sinr_total - \
+            np.nansum(parent._users_sinr[affected]) + total
+        self._sinr = round(self._sinr_total, 3)
+
+        self._connected_users = parent._connected_users + \
+            int(np.count_nonzero(self._serving[affected] >= 0)) - \
+            int(np.count_nonzero(parent._serving[affected] >= 0))
+        self._cost = parent._cost + \
+            int(np.sum(np.where(active[flipped], 1, -1) * cell_cost[flipped]))
+        self._set_fitness()
+        self._evaluated_coords = self._coords.copy()
 
     def pprint(self):
         """Print the plan's attributes."""
@@ -281,8 +663,8 @@ class Plan(object):
         active cells        : {}
         """.format(self.get_fitness(),
                    self.get_num_of_connected_users(),
-                   len(self.get_users()),
-                   (self.get_num_of_connected_users() / NUM_USERS) * 100,
+                   self.get_num_users(),
+                   (self.get_num_of_connected_users() / self._config.NUM_USERS) * 100,
                    self.get_cost(),
                    self.get_sinr(),
                    active_cells)
@@ -0,0 +1,71 @@
+import numpy as np
+
+from .cell import Cell
+from .plan import Plan
+from ..consts.config import DEFAULT_CONFIG
+
+
+NON_FIXED_CELL_TYPES = ("macro", "micro", "pico", "femto")
+
+
+class Population(object):
+    """Array backed population of plans (structure of arrays).
+
+    The chromosomes of all the plans are kept in a single coordinates array,
+    Plan objects are only built on demand as thin views whose non fixed cells
+    read and write their row of that array.
+
+    Attributes:
+        _coords: (array) of shape (plans, non fixed cells, 2) with the
+                 coordinates of the non fixed cells of every plan.
+        _cell_types: (array of) str, the type of each non fixed cell slot
+                     (grouped as macro, micro, pico then femto cells).
+        _fixed_macro_cells: (list of) fixed macro cells shared by every plan.
+        _users: (array) of shape (users, 2) with the users coordinates, shared
+                by every plan.
+        _candidate_points: (list of) candidate points.
+        _config: (Config) settings of the plans.
+    """
+
+    def __init__(self, coords, cell_types, fixed_macro_cells, users, candidate_points,
+                 config=DEFAULT_CONFIG):
+        self._config = config
+        self._coords = coords
+        self._cell_types = np.asarray(cell_types)
+        self._fixed_macro_cells = fixed_macro_cells
+        self._users = users
+        self._candidate_points = candidate_points
+
+    # getters
+    def __len__(self):
+        return len(self._coords)
+
+    def get_coords(self):
+        return self._coords
+
+    def get_cell_types(self):
+        return self._cell_types
+
+    def get_num_cells(self, cell_type="macro"):
+        return int(np.count_nonzero(self._cell_types == cell_type))
+
+    def get_config(self):
+        return self._config
+
+    def get_plan(self, index):
+        """Returns a Plan view of the plan at index."""
+        row = self._coords[index]
+        cells = [Cell(x, y, cell_type, self._config) for (x, y), cell_type in
+                 zip(row.tolist(), self._cell_types.tolist())]
+
+        return Plan(self._fixed_macro_cells + cells,
+                    self._users,
+                    self._candidate_points,
+                    len(self._fixed_macro_cells),
+                    *[self.get_num_cells(cell_type) for cell_type in NON_FIXED_CELL_TYPES],
+                    coords=row,
+                    config=self._config)
+
+    def get_plans(self):
+        """Returns Plan views of every plan in the population."""
+        return [self.get_plan(i) for i in range(len(self))]
@@ -1,6 +1,9 @@
 class User(object):
     """Representation of a single user in an area.
 
+    Plans keep the users as a shared coordinates array and their association
+    as arrays, User objects are built from them on demand (Plan.get_users()).
+
     Attributes:
         _xcoord: (int) the x coordinate of the user.
         _ycoord: (int) the y coordinate of the user.
@@ -1,28 +1,26 @@
 import numpy as np
-from ..helper_funcs.helper import calculate_probability
 
-def roulette_wheel_selection(population):
-    """Apply Roulette Wheel Selection method.
+
+def roulette_wheel_selection_indices(fitness, size=None):
+    """Roulette Wheel Selection over an array of fitness values.
+
+    Every spin lands on the first member whose cumulative probability
+    reaches a uniform draw, all the spins are drawn and resolved at once.
 
     Args:
-        population: (list of) plans of the current generation.
+        fitness: (array) fitness of each member of the population.
+        size: (int) number of members to select (defaults to the population size).
 
     Returns:
-        (list of) most fit members of the current population.
+        (array) indices of the selected members.
     """
 
-    new_mating_pool = []
-
-    calculate_probability(population)
-
-    while(len(new_mating_pool) < len(population)):
-        relative_probability = 0.0
-        r = np.random.uniform(0, 1)
-
-        for plan in population:
-            relative_probability += plan.get_probability()
-            if relative_probability >= r:
-                new_mating_pool.append(plan)
-                break
+    fitness = np.asarray(fitness, dtype=float)
+    if size is None:
+        size = len(fitness)
 
-    return new_mating_pool
+    # probabilities summed member after member, like the original loop
+    relative_probability = np.cumsum(fitness / np.cumsum(fitness)[-1])
+    r = np.random.uniform(0, 1, size)
+    selected = np.searchsorted(relative_probability, r)
+    return np.minimum(selected, len(fitness) - 1)
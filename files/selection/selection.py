@@ -1,8 +1,8 @@
-from .rws import roulette_wheel_selection
-from .sus import stochastic_universal_sampling
-from .ts import tournament_selection
+from .rws import roulette_wheel_selection_indices
+from .sus import stochastic_universal_sampling_indices
+from .ts import tournament_selection_indices
 
-def selection(population, method):
+def selection(population, method, size=None):
     """Apply selection method of a given population.
 
     Args:
@@ -11,16 +11,37 @@ def selection(population, method):
             - rws (Roulette Wheel Selection)
             - sus (Stochastic Universal Selection)
             - ts  (Tournament Selection)
+        size: (int) number of plans to select (defaults to the population size).
 
     Returns:
         (list of) plans representing the new pool
     """
 
+    fitness = [plan.get_fitness() for plan in population]
+    return [population[i] for i in selection_indices(fitness, method, size).tolist()]
+
+
+def selection_indices(fitness, method, size=None, tournament_size=2):
+    """Apply selection method on an array of fitness values.
+
+    Args:
+        fitness: (array) fitness of each member of the population.
+        method: (str) selection method:
+            - rws (Roulette Wheel Selection)
+            - sus (Stochastic Universal Selection)
+            - ts  (Tournament Selection)
+        size: (int) number of members to select (defaults to the population size).
+        tournament_size: (int) number of contestants of each tournament (ts only).
+
+    Returns:
+        (array) indices of the selected members.
+    """
+
     if method == "rws":
-        return roulette_wheel_selection(population)
+        return roulette_wheel_selection_indices(fitness, size)
 
     elif method == "sus":
-        return stochastic_universal_sampling(population)
+        return stochastic_universal_sampling_indices(fitness, size)
 
     elif method == "ts":
-        return tournament_selection(population)
+        return tournament_selection_indices(fitness, size, tournament_size)
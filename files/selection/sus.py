@@ -1,30 +1,26 @@
 import numpy as np
-from ..helper_funcs.helper import calculate_probability
 
-def stochastic_universal_sampling(population):
-    """Apply Stochastic Universal Selection method.
+
+def stochastic_universal_sampling_indices(fitness, size=None):
+    """Stochastic Universal Sampling over an array of fitness values.
+
+    A single uniform draw places size equally spaced pointers, each pointer
+    selects the first member whose cumulative probability reaches it.
 
     Args:
-        population: (list of) plans of the current generation.
+        fitness: (array) fitness of each member of the population.
+        size: (int) number of members to select (defaults to the population size).
 
     Returns:
-        (list of) most fit members of the current population.
+        (array) indices of the selected members (in population order).
     """
 
-    new_mating_pool = []
-
-    calculate_probability(population)
-    r = np.random.uniform(0, 1 / len(population))
-    relative_probability = 0.0
-    current_member = 0
-
-    while(len(new_mating_pool) < len(population)):
-        relative_probability += population[current_member].get_probability()
-
-        while(r <= relative_probability):
-            new_mating_pool.append(population[current_member])
-            r += 1 / len(population)
-
-            current_member += 1
+    fitness = np.asarray(fitness, dtype=float)
+    if size is None:
+        size = len(fitness)
 
-    return new_mating_pool
+    relative_probability = np.cumsum(fitness / np.cumsum(fitness)[-1])
+    r = np.random.uniform(0, 1 / size)
+    pointers = r + np.arange(size) / size
+    selected = np.searchsorted(relative_probability, pointers)
+    return np.minimum(selected, len(fitness) - 1)
@@ -1,27 +1,25 @@
-import copy
+import numpy as np
 
-import numpy.random as nprandom
 
+def tournament_selection_indices(fitness, size=None, k=2):
+    """k-way Tournament Selection over an array of fitness values.
 
-def tournament_selection(population):
-    """Apply Tournament Selection method.
+    The contestants of every tournament are drawn at once as a (size, k)
+    index matrix, the first of the fittest contestants wins.
 
     Args:
-        population: (list of) plans of the current generation.
+        fitness: (array) fitness of each member of the population.
+        size: (int) number of tournaments (defaults to the population size).
+        k: (int) number of contestants of each tournament.
 
     Returns:
-        (list of) most fit members of the current population.
+        (array) indices of the winners.
     """
 
-    old_pool = copy.deepcopy(population)
-    new_mating_pool = []
+    fitness = np.asarray(fitness, dtype=float)
+    if size is None:
+        size = len(fitness)
 
-    for _ in range(len(population)):
-        f1 = nprandom.choice(old_pool)
-        f2 = nprandom.choice(old_pool)
-
-        if f1.get_fitness() >= f2.get_fitness():
-            new_mating_pool.append(f1)
-        else:
-            new_mating_pool.append(f2)
-    return new_mating_pool
+    contestants = np.random.randint(0, len(fitness), (size, k))
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(size), winners]
@@ -0,0 +1,139 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import itertools
+import os
+
+from .consts.config import DEFAULT_CONFIG
+from .helper_funcs.generators_funcs import generate_scenario
+from .main import main
+
+
+# grid of the sweep run by python -m files.sweep
+SWEEP_GRID = {
+    "SELECTION_METHOD": ["rws", "sus", "ts"],
+    "ALPHA": [0.2, 0.4, 0.6],
+    "MUTATION_PROBABILTY": [0.2, 0.4],
+    "SEED": [0, 1, 2]
+}
+
+# settings of every run of a sweep unless the grid sets them: runs are quiet,
+# leave no figures, best plans, metrics, profiles or checkpoints behind and use
+# a single process
+SWEEP_SETTINGS = {
+    "PRINT_PLANS": False,
+    "RENDER_POLICY": "none",
+    "BEST_PLANS_PATH": None,
+    "METRICS_PATH": None,
+    "PROFILE_GENERATIONS": None,
+    "CHECKPOINT_INTERVAL": 0,
+    "RESUME": False,
+    "GENERATION_WORKERS": 1,
+    "EVALUATION_WORKERS": 1
+}
+
+# state of a worker process, set by _init_sweeper()
+_sweeper = {}
+
+
+def expand_grid(grid):
+    """Returns every combination of the values of a grid.
+
+    Args:
+        grid: (dict) values of each setting, e.g. {"ALPHA": [0.2, 0.4]}.
+
+    Returns:
+        (list of) dicts, the settings of each run (the last setting of the
+        grid changes first).
+    """
+
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _init_sweeper(base, scenarios):
+    _sweeper["base"] = base
+    _sweeper["scenarios"] = scenarios
+
+
+def _run(settings):
+    """Run the GA with the settings of a run of the sweep (in a worker process)."""
+    config = _sweeper["base"].replace(**settings)
+    best_plans = main(config, _sweeper["scenarios"][config.scenario()])
+
+    generation = max(range(len(best_plans)), key=lambda i: best_plans[i].get_fitness())
+    best = best_plans[generation]
+    row = dict(settings)
+    row.update({
+        "fitness": best.get_fitness(),
+        "cost": best.get_cost(),
+        "SINR": best.get_sinr(),
+        "connected users": best.get_num_of_connected_users(),
+        "generation": generation,
+        "generations": len(best_plans) - 1,
+        "final fitness": best_plans[-1].get_fitness()
+    })
+    return row
+
+
+def sweep(grid, base=DEFAULT_CONFIG, workers=1, path=None, scenario_seed=0):
+    """Run the GA for every combination of settings of a grid.
+
+    The users and candidate points of each scenario (see Config.scenario())
+    are generated once and shared by the runs of that scenario, e.g. a grid
+    over SELECTION_METHOD and SEED generates a single scenario. Runs without a
+    SEED get the index of the run as seed and runs without a SCENARIO_SEED get
+    scenario_seed, so main() with the settings of a row reproduces it.
+
+    Args:
+        grid: (dict) values of each setting (see expand_grid()).
+        base: (Config) settings shared by every run (SWEEP_SETTINGS are
+              applied on top of it).
+        workers: (int) number of worker processes running the GA (1 runs them
+                 one after the other in this process).
+        path: (str) CSV file receiving one row per run, None to skip it.
+        scenario_seed: (int) SCENARIO_SEED of the runs without one.
+
+    Returns:
+        (list of) dicts, the settings of each run with the fitness, cost,
+        SINR, connected users and generation of its best plan, the number of
+        generations run (fewer than NUM_GENERATIONS when it stalls) and the
+        fitness of its last generation.
+    """
+
+    base = base.replace(**SWEEP_SETTINGS)
+    runs = expand_grid(grid)
+    for i, settings in enumerate(runs):
+        config = base.replace(**settings)
+        if config.SEED is None:
+            settings["SEED"] = i
+        if config.SCENARIO_SEED is None:
+            settings["SCENARIO_SEED"] = scenario_seed
+
+    scenarios = {}
+    for settings in runs:
+        config = base.replace(**settings)
+        if config.scenario() not in scenarios:
+            scenarios[config.scenario()] = generate_scenario(config)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_sweeper,
+                                 initargs=(base, scenarios)) as executor:
+            rows = list(executor.map(_run, runs))
+    else:
+        _init_sweeper(base, scenarios)
+        rows = [_run(settings) for settings in runs]
+
+    if path is not None:
+        with open(path, mode="w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return rows
+
+
+if __name__ == "__main__":
+    if "figs" not in os.listdir("files"):
+        os.mkdir("files/figs")
+    sweep(SWEEP_GRID, workers=os.cpu_count(), path="files/figs/sweep.csv")
@@ -0,0 +1,67 @@
+import numpy as np
+
+from files.consts.config import DEFAULT_CONFIG
+from files.helper_funcs.generators_funcs import generate_population, generate_scenario
+
+
+METHODS = ("loop", "vectorized", "grid")
+
+
+def _plans(num_plans=3):
+    """Plans of a small scenario, the same for every call."""
+    config = DEFAULT_CONFIG.replace(NUM_USERS=300, SCENARIO_SEED=0)
+    users, candidate_points = generate_scenario(config)
+    np.random.seed(0)
+    population = generate_population(num_plans,
+                                     list(candidate_points),
+                                     users,
+                                     config.NUM_FIXED_MACRO,
+                                     config.FIXED_MACRO_RADIUS,
+                                     config.NUM_MACRO,
+                                     config.MACRO_RADIUS,
+                                     config.NUM_MICRO,
+                                     config.MICRO_RADIUS,
+                                     config.NUM_PICO,
+                                     config.PICO_RADIUS,
+                                     config.NUM_FEMTO,
+                                     config.FEMTO_RADIUS,
+                                     config=config)
+    return population.get_plans()
+
+
+def _operated(method, seed=0):
+    plans = _plans()
+    for i, plan in enumerate(plans):
+        plan.operate(method, np.random.RandomState(seed + i))
+    return plans
+
+
+def _sorted_links(plan):
+    link_users, link_cells, distances, power = plan._close_links
+    order = np.lexsort((link_cells, link_users))
+    return link_users[order], link_cells[order], distances[order], power[order]
+
+
+def test_backends_associate_the_same_users():
+    expected = _operated("loop")
+    assert all((reference._serving >= 0).any() for reference in expected)
+    for method in METHODS[1:]:
+        for plan, reference in zip(_operated(method), expected):
+            assert np.array_equal(plan._serving, reference._serving)
+
+
+def test_backends_keep_the_same_close_links():
+    expected = _operated("loop")
+    for method in METHODS[1:]:
+        for plan, reference in zip(_operated(method), expected):
+            for values, reference_values in zip(_sorted_links(plan), _sorted_links(reference)):
+                assert np.array_equal(values, reference_values)
+
+
+def test_backends_compute_the_same_sinr_and_fitness():
+    expected = _operated("loop")
+    for method in METHODS[1:]:
+        for plan, reference in zip(_operated(method), expected):
+            assert np.array_equal(plan._users_sinr, reference._users_sinr, equal_nan=True)
+            assert plan.get_sinr() == reference.get_sinr()
+            assert plan.get_fitness() == reference.get_fitness()
@@ -0,0 +1,69 @@
+import numpy as np
+
+from files.consts.config import DEFAULT_CONFIG
+from files.evaluation.cache import EvaluationCache
+from files.helper_funcs.checkpoint_funcs import load_checkpoint, save_checkpoint
+from files.main import main
+
+
+def _config(tmp_path, **settings):
+    """Settings of a small run writing nothing but its checkpoint."""
+    return DEFAULT_CONFIG.replace(NUM_USERS=300,
+                                  NUM_CHROMOSOMES=10,
+                                  SEED=0,
+                                  SCENARIO_SEED=0,
+                                  PRINT_PLANS=False,
+                                  METRICS_PATH=None,
+                                  RENDER_POLICY="none",
+                                  BEST_PLANS_PATH=None,
+                                  CHECKPOINT_PATH=str(tmp_path / "checkpoint.npz"),
+                                  **settings)
+
+
+def _same_plans(plans, expected):
+    assert len(plans) == len(expected)
+    for plan, reference in zip(plans, expected):
+        assert np.array_equal(plan.get_coords(), reference.get_coords())
+        assert plan.get_results() == reference.get_results()
+
+
+def _resumed_run(tmp_path, monkeypatch, generations, checkpoint, **settings):
+    """Best plans of a run straight through and of a run stopped after the
+    checkpoint of generation checkpoint then resumed."""
+    # main() creates files/figs under the working directory
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "files").mkdir(exist_ok=True)
+
+    config = _config(tmp_path, NUM_GENERATIONS=generations, **settings)
+    straight = main(config)
+    main(config.replace(NUM_GENERATIONS=checkpoint, CHECKPOINT_INTERVAL=checkpoint))
+    resumed = main(config.replace(RESUME=True))
+    return straight, resumed
+
+
+def test_resumed_run_ends_like_the_straight_run(tmp_path, monkeypatch):
+    straight, resumed = _resumed_run(tmp_path, monkeypatch, 4, 2)
+    _same_plans(resumed, straight)
+
+
+def test_resumed_run_with_a_cache_ends_like_the_straight_run(tmp_path, monkeypatch):
+    straight, resumed = _resumed_run(tmp_path, monkeypatch, 4, 2,
+                                     EVALUATION_CACHE_SIZE=100,
+                                     SELECTION_METHOD="ts")
+    _same_plans(resumed, straight)
+
+
+def test_empty_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "files").mkdir()
+    config = _config(tmp_path, NUM_GENERATIONS=0)
+    best_plans = main(config)
+
+    save_checkpoint(config.CHECKPOINT_PATH, 0, best_plans, best_plans, EvaluationCache(10))
+    cache = EvaluationCache(10)
+    generation, pool, restored = load_checkpoint(config.CHECKPOINT_PATH, cache, config)
+
+    assert generation == 0
+    assert len(cache) == 0
+    _same_plans(pool, best_plans)
+    _same_plans(restored, best_plans)
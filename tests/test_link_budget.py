@@ -0,0 +1,36 @@
+import numpy as np
+
+from files.network.link_budget import LinkBudget
+
+
+def _budget(resolution):
+    return LinkBudget([("macro", 40, 3.5, 15), ("femto", 10, 28, 20)],
+                      resolution,
+                      max_distance=1000)
+
+
+def test_quantized_loss_of_a_user_on_a_cell_is_finite():
+    budget = _budget(10)
+    distances = np.array([0.0, 2.0, 4.9, 5.1, 10.0])
+
+    loss = budget.distance_loss(distances)
+
+    assert np.all(np.isfinite(loss))
+    assert np.allclose(loss, 20 * np.log10(10 / 1000))
+    assert np.isfinite(budget.distance_loss(0.0))
+
+
+def test_quantized_received_power_of_a_user_on_a_cell_is_finite():
+    budget = _budget(10)
+
+    for cell_type in ("macro", "femto"):
+        power = budget.received_power(cell_type, 0.0, np.random.RandomState(0))
+        assert np.isfinite(power)
+
+
+def test_quantized_loss_matches_the_exact_loss_on_the_steps():
+    exact = _budget(None)
+    quantized = _budget(10)
+    distances = np.arange(10.0, 1000.0, 10.0)
+
+    assert np.allclose(quantized.distance_loss(distances), exact.distance_loss(distances))
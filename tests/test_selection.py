@@ -0,0 +1,96 @@
+import numpy as np
+
+from files.selection.rws import roulette_wheel_selection_indices
+from files.selection.selection import selection
+from files.selection.sus import stochastic_universal_sampling_indices
+from files.selection.ts import tournament_selection_indices
+
+
+class _Member(object):
+    """Stands for a plan, selection only reads the fitness."""
+
+    def __init__(self, fitness):
+        self._fitness = fitness
+
+    def get_fitness(self):
+        return self._fitness
+
+
+def _fitness(seed, size=50):
+    return np.round(np.random.RandomState(seed).uniform(1.9, 2.1, size), 3).tolist()
+
+
+def _roulette_wheel_loop(fitness):
+    """The original roulette wheel loop, returning indices."""
+    total_sum = sum(fitness)
+    selected = []
+    while len(selected) < len(fitness):
+        relative_probability = 0.0
+        r = np.random.uniform(0, 1)
+        for i, member_fitness in enumerate(fitness):
+            relative_probability += member_fitness / total_sum
+            if relative_probability >= r:
+                selected.append(i)
+                break
+    return selected
+
+
+def _tournament_loop(fitness):
+    """The original two-way tournament loop, returning indices."""
+    selected = []
+    for _ in range(len(fitness)):
+        f1 = np.random.choice(len(fitness))
+        f2 = np.random.choice(len(fitness))
+        selected.append(f1 if fitness[f1] >= fitness[f2] else f2)
+    return selected
+
+
+def test_roulette_wheel_picks_what_the_loop_picks():
+    for seed in range(5):
+        fitness = _fitness(seed)
+        np.random.seed(seed)
+        expected = _roulette_wheel_loop(fitness)
+        np.random.seed(seed)
+        assert roulette_wheel_selection_indices(fitness).tolist() == expected
+
+
+def test_tournament_picks_what_the_loop_picks():
+    for seed in range(5):
+        fitness = _fitness(seed)
+        # ties are won by the first contestant, like the loop
+        fitness[1] = fitness[0]
+        np.random.seed(seed)
+        expected = _tournament_loop(fitness)
+        np.random.seed(seed)
+        assert tournament_selection_indices(fitness).tolist() == expected
+
+
+def test_selection_maps_the_indices_back_on_the_plans():
+    fitness = _fitness(0)
+    pool = [_Member(value) for value in fitness]
+    for method, kernel in (("rws", roulette_wheel_selection_indices),
+                           ("sus", stochastic_universal_sampling_indices),
+                           ("ts", tournament_selection_indices)):
+        np.random.seed(0)
+        expected = [pool[i] for i in kernel(fitness).tolist()]
+        np.random.seed(0)
+        assert selection(pool, method) == expected
+
+
+def test_sus_gives_a_dominant_member_its_share_of_pointers():
+    fitness = [91.0] + [1.0] * 9
+    for seed in range(20):
+        np.random.seed(seed)
+        counts = np.bincount(stochastic_universal_sampling_indices(fitness), minlength=10)
+        assert counts.sum() == 10
+        assert counts[0] in (9, 10)
+        assert counts[1:].max() <= 1
+
+
+def test_sus_shares_never_stray_by_a_pointer_or_more():
+    for seed in range(20):
+        fitness = np.array(_fitness(seed, 20))
+        expected = len(fitness) * fitness / fitness.sum()
+        np.random.seed(seed)
+        counts = np.bincount(stochastic_universal_sampling_indices(fitness), minlength=20)
+        assert np.all(np.abs(counts - expected) < 1)